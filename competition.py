@@ -0,0 +1,373 @@
+#competition.py
+
+import numpy as np
+from numba import njit, prange
+
+# Scalar constants used by the kernels, kept in single precision like the plant arrays and grids.
+# Numba types a plain Python float literal as float64, which would promote every expression it
+# touches to double precision (half the SIMD lanes per instruction).
+ZERO = np.float32(0.0)
+HALF = np.float32(0.5)
+PI = np.float32(np.pi)
+
+@njit(cache=True)
+def _grid_bounds(x, y, radius, inv_cell, max_gx_limit, max_gy_limit, bounds, i, offset):
+    """Stores the clamped grid-cell bounding box of a circle into bounds[i, offset:offset + 4]."""
+    bounds[i, offset] = int(max(0, (x - radius) * inv_cell))
+    bounds[i, offset + 1] = int(min(max_gx_limit, (x + radius) * inv_cell))
+    bounds[i, offset + 2] = int(max(0, (y - radius) * inv_cell))
+    bounds[i, offset + 3] = int(min(max_gy_limit, (y + radius) * inv_cell))
+
+@njit(cache=True)
+def _quantize_height(height, height_resolution):
+    """Converts a height in cm to the light grid's uint16 fixed-point units, saturating at the top."""
+    return min(65535, int(height / height_resolution + HALF))
+
+@njit(cache=True, fastmath=True)
+def _column_span(dx_sq, y, radius_sq, cell_centers_y, min_gy, max_gy, inv_cell):
+    """
+    Returns the first and last gy in [min_gy, max_gy] whose cell center lies inside a circle,
+    for one grid column dx_sq away from its center, or an empty range (first > last).
+    It solves for the span instead of testing each cell, so a center lying exactly on the
+    circle may round either way.
+    """
+    remaining = radius_sq - dx_sq
+    if remaining < 0: return 0, -1
+    half_width = np.sqrt(remaining)
+    # Cell gy's center is at (gy + 0.5) cells, so these are the centers within half_width of y.
+    first = max(min_gy, int(np.ceil((y - half_width) * inv_cell - HALF)))
+    last = min(max_gy, int(np.floor((y + half_width) * inv_cell - HALF)))
+    return first, last
+
+@njit(cache=True)
+def _small_circle_cell(x, y, radius_sq, inv_cell, cell_centers_x, cell_centers_y, min_gx, max_gx, min_gy, max_gy):
+    """
+    For a circle less than half a cell in radius, returns the only cell whose center it can
+    contain: the cell it sits in. Returns (-1, -1) if that center is outside the circle or
+    outside the given range of cells.
+    """
+    gx = int(x * inv_cell)
+    gy = int(y * inv_cell)
+    if gx < min_gx or gx > max_gx or gy < min_gy or gy > max_gy: return -1, -1
+    dx = x - cell_centers_x[gx]
+    dy = y - cell_centers_y[gy]
+    if dx * dx + dy * dy > radius_sq: return -1, -1
+    return gx, gy
+
+@njit(cache=True, fastmath=True)
+def _overlap_ratio(pressure, root_radius):
+    """
+    Returns the share of a root cell's pressure that comes from other plants' roots, or 0 if
+    there is none. It is written with max instead of a branch on pressure > root_radius, so
+    the loop summing it vectorizes. root_radius is positive, so the division is always safe.
+    """
+    return max(pressure - root_radius, ZERO) / max(pressure, root_radius)
+
+@njit(cache=True)
+def _canopy_is_covered(light_grid, min_gx, max_gx, min_gy, max_gy, height):
+    """Returns True if every light cell in the box is already at least as tall as height."""
+    for gx in range(min_gx, max_gx + 1):
+        for gy in range(min_gy, max_gy + 1):
+            if light_grid[gx, gy] < height:
+                return False
+    return True
+
+@njit(cache=True)
+def _mark_tiles(bounds, i, dirty_tiles, tiles_y, tile_cells):
+    """Flags every grid tile touched by row i of bounds (a canopy box and a root box) for a redraw."""
+    for tx in range(min(bounds[i, 0], bounds[i, 4]) // tile_cells, max(bounds[i, 1], bounds[i, 5]) // tile_cells + 1):
+        for ty in range(min(bounds[i, 2], bounds[i, 6]) // tile_cells, max(bounds[i, 3], bounds[i, 7]) // tile_cells + 1):
+            dirty_tiles[tx * tiles_y + ty] = True
+
+@njit(cache=True)
+def _touches_dirty_tile(tile_bounds, i, dirty_tiles, tiles_y):
+    """Returns True if any grid tile that plant i's boxes touch was redrawn in this update."""
+    for tx in range(tile_bounds[i, 0], tile_bounds[i, 1] + 1):
+        for ty in range(tile_bounds[i, 2], tile_bounds[i, 3] + 1):
+            if dirty_tiles[tx * tiles_y + ty]:
+                return True
+    return False
+
+@njit(cache=True)
+def _is_alone_in_tiles(tile_bounds, i, tile_starts, tiles_y):
+    """Returns True if no other plant's boxes touch any grid tile that plant i's boxes touch."""
+    for tx in range(tile_bounds[i, 0], tile_bounds[i, 1] + 1):
+        for ty in range(tile_bounds[i, 2], tile_bounds[i, 3] + 1):
+            tile = tx * tiles_y + ty
+            if tile_starts[tile + 1] - tile_starts[tile] > 1:
+                return False
+    return True
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _rasterize_tiled(xs, ys, radii, heights, root_radii, count, light_grid, root_grid, cell_centers_x, cell_centers_y,
+                     inv_cell, height_resolution, bounds, tile_cells, dirty_tiles):
+    """
+    Phase 1 of the competition kernel. Plants are bucketed by the grid tiles their boxes touch,
+    and the grids are then filled one tile at a time, so the cells being written stay in cache.
+    Each bucket lists plants in index order, so every cell sees the same sequence of updates
+    as an untiled pass and the summed root grid is bit-identical. Tiles never share cells,
+    so they are filled in parallel without locks or per-thread copies of the grids.
+    The light grid only keeps a maximum, so its order doesn't matter: each tile writes its
+    canopies tallest first, and a plant whose box is already fully covered by taller
+    canopies is skipped after a cheap scan, without any distance tests.
+    Circles are drawn as one span of cells per column (see _column_span), so the cells of
+    the bounding box outside the circle are never visited and the inner loops are branch-free.
+    Circles under half a cell in radius, like most seedlings, can cover at most one cell and
+    write it directly (see _small_circle_cell).
+    Only the tiles flagged in dirty_tiles are cleared and redrawn; the others keep their cells.
+    Returns the CSR start offsets of the tile buckets and each plant's tile range, as
+    (min_tx, max_tx, min_ty, max_ty), so phase 2 can tell how crowded a plant's tiles are.
+    """
+    grid_w = light_grid.shape[0]
+    grid_h = light_grid.shape[1]
+    tiles_x = (grid_w + tile_cells - 1) // tile_cells
+    tiles_y = (grid_h + tile_cells - 1) // tile_cells
+
+    # --- Count, then fill, the plants touching each tile (a compact CSR layout) ---
+    tile_counts = np.zeros(tiles_x * tiles_y + 1, dtype=np.int64)
+    # Each plant's tile range covers both of its boxes. It is worked out once here and reused
+    # by the fill passes and phase 2, instead of being derived from the boxes each time.
+    tile_bounds = np.empty((count, 4), dtype=np.int32)
+    # Most plants are small enough to sit inside a single tile. Their tile is noted here,
+    # so the fill passes below place them directly instead of looping over a tile range.
+    single_tiles = np.full(count, -1, dtype=np.int64)
+    for i in range(count):
+        if radii[i] <= 0: continue
+        min_tx = min(bounds[i, 0], bounds[i, 4]) // tile_cells
+        max_tx = max(bounds[i, 1], bounds[i, 5]) // tile_cells
+        min_ty = min(bounds[i, 2], bounds[i, 6]) // tile_cells
+        max_ty = max(bounds[i, 3], bounds[i, 7]) // tile_cells
+        tile_bounds[i, 0] = min_tx
+        tile_bounds[i, 1] = max_tx
+        tile_bounds[i, 2] = min_ty
+        tile_bounds[i, 3] = max_ty
+        if min_tx == max_tx and min_ty == max_ty:
+            single_tiles[i] = min_tx * tiles_y + min_ty
+            tile_counts[single_tiles[i] + 1] += 1
+            continue
+        for tx in range(min_tx, max_tx + 1):
+            for ty in range(min_ty, max_ty + 1):
+                tile_counts[tx * tiles_y + ty + 1] += 1
+    tile_starts = np.cumsum(tile_counts)
+    tile_fill = tile_starts[:-1].copy()
+    tile_plants = np.empty(tile_starts[-1], dtype=np.int32)
+    for i in range(count):
+        if radii[i] <= 0: continue
+        tile = single_tiles[i]
+        if tile >= 0:
+            tile_plants[tile_fill[tile]] = i
+            tile_fill[tile] += 1
+            continue
+        for tx in range(tile_bounds[i, 0], tile_bounds[i, 1] + 1):
+            for ty in range(tile_bounds[i, 2], tile_bounds[i, 3] + 1):
+                tile = tx * tiles_y + ty
+                tile_plants[tile_fill[tile]] = i
+                tile_fill[tile] += 1
+
+    # The same buckets again, but listed tallest first for the light grid.
+    order = np.argsort(-heights[:count])
+    tile_fill[:] = tile_starts[:-1]
+    tile_plants_by_height = np.empty(tile_starts[-1], dtype=np.int32)
+    for i in order:
+        if radii[i] <= 0: continue
+        tile = single_tiles[i]
+        if tile >= 0:
+            tile_plants_by_height[tile_fill[tile]] = i
+            tile_fill[tile] += 1
+            continue
+        for tx in range(tile_bounds[i, 0], tile_bounds[i, 1] + 1):
+            for ty in range(tile_bounds[i, 2], tile_bounds[i, 3] + 1):
+                tile = tx * tiles_y + ty
+                tile_plants_by_height[tile_fill[tile]] = i
+                tile_fill[tile] += 1
+
+    # --- Redraw the dirty tiles, walking along the contiguous y axis first ---
+    for tile in prange(tiles_x * tiles_y):
+        if not dirty_tiles[tile]: continue
+        tile_min_gx = (tile // tiles_y) * tile_cells
+        tile_max_gx = min(grid_w, tile_min_gx + tile_cells) - 1
+        tile_min_gy = (tile % tiles_y) * tile_cells
+        tile_max_gy = min(grid_h, tile_min_gy + tile_cells) - 1
+        light_grid[tile_min_gx:tile_max_gx + 1, tile_min_gy:tile_max_gy + 1] = 0
+        root_grid[tile_min_gx:tile_max_gx + 1, tile_min_gy:tile_max_gy + 1] = 0
+        for k in range(tile_starts[tile], tile_starts[tile + 1]):
+            i = tile_plants_by_height[k]
+            height = _quantize_height(heights[i], height_resolution)
+            min_gx = max(bounds[i, 0], tile_min_gx)
+            max_gx = min(bounds[i, 1], tile_max_gx)
+            min_gy = max(bounds[i, 2], tile_min_gy)
+            max_gy = min(bounds[i, 3], tile_max_gy)
+            x = xs[i]
+            y = ys[i]
+            radius = radii[i]
+            radius_sq = radius * radius
+            if radius * inv_cell < HALF:
+                gx, gy = _small_circle_cell(x, y, radius_sq, inv_cell, cell_centers_x, cell_centers_y, min_gx, max_gx, min_gy, max_gy)
+                if gx >= 0:
+                    light_grid[gx, gy] = max(light_grid[gx, gy], height)
+                continue
+            # Under a closed canopy, the taller plants written before this one already cover its box.
+            if _canopy_is_covered(light_grid, min_gx, max_gx, min_gy, max_gy, height): continue
+
+            for gx in range(min_gx, max_gx + 1):
+                dx = x - cell_centers_x[gx]
+                first_gy, last_gy = _column_span(dx * dx, y, radius_sq, cell_centers_y, min_gy, max_gy, inv_cell)
+                for gy in range(first_gy, last_gy + 1):
+                    light_grid[gx, gy] = max(light_grid[gx, gy], height)
+
+        for k in range(tile_starts[tile], tile_starts[tile + 1]):
+            i = tile_plants[k]
+            x = xs[i]
+            y = ys[i]
+            root_radius = root_radii[i]
+            root_radius_sq = root_radius * root_radius
+            min_gx = max(bounds[i, 4], tile_min_gx)
+            max_gx = min(bounds[i, 5], tile_max_gx)
+            min_gy = max(bounds[i, 6], tile_min_gy)
+            max_gy = min(bounds[i, 7], tile_max_gy)
+            if root_radius * inv_cell < HALF:
+                gx, gy = _small_circle_cell(x, y, root_radius_sq, inv_cell, cell_centers_x, cell_centers_y, min_gx, max_gx, min_gy, max_gy)
+                if gx >= 0:
+                    root_grid[gx, gy] += root_radius
+                continue
+            for gx in range(min_gx, max_gx + 1):
+                dx = x - cell_centers_x[gx]
+                first_gy, last_gy = _column_span(dx * dx, y, root_radius_sq, cell_centers_y, min_gy, max_gy, inv_cell)
+                for gy in range(first_gy, last_gy + 1):
+                    root_grid[gx, gy] += root_radius
+
+    return tile_starts, tile_bounds
+
+@njit(cache=True, parallel=True, fastmath=True)
+def compute_plant_competition(xs, ys, radii, heights, root_radii, raster_radii, raster_heights, raster_root_radii,
+                              raster_pending, bounds, count, removed_bounds, dirty_tiles, full_rebuild, redraw_threshold,
+                              light_grid, root_grid, cell_size, cell_centers_x, cell_centers_y, height_resolution, tile_cells,
+                              shaded_canopy_areas, overlapped_root_areas):
+    """
+    Runs both passes of the competition update in one compiled kernel.
+    Phase 1 writes the tallest canopy height into the light grid and sums root radii into
+    the root grid. Phase 2 reads the grids back to find, per plant, the shaded canopy area
+    and the overlapped root area.
+    The grids persist between updates and are redrawn incrementally. Each plant is drawn with
+    the snapshot of its geometry in raster_radii, raster_heights and raster_root_radii, which is
+    only refreshed once the live value drifts more than redraw_threshold cm from it (or for new
+    plants, flagged in raster_pending). Every grid tile touched by a refreshed plant, before or
+    after the change, or by a removed plant (the rows of removed_bounds) is flagged in
+    dirty_tiles. Only those tiles are redrawn, from scratch, and only plants touching them get
+    new results; the others keep their output slots. full_rebuild refreshes every plant and
+    tile, which bounds how long small changes can go unseen. dirty_tiles is cleared on return.
+    It is compiled with fastmath, which lets LLVM vectorize the per-plant sums; the root overlap
+    totals may differ from a strict evaluation in the last bits, and the grids are unaffected.
+    The light grid is uint16, holding heights in steps of height_resolution cm. Plants compare
+    their own height in the same units, so a plant can never be shaded by its own rounding.
+    bounds caches each plant's canopy box (columns 0-3) and root box (columns 4-7) as
+    (min_gx, max_gx, min_gy, max_gy), for its snapshot geometry.
+    cell_centers_x and cell_centers_y hold the world coordinates of every column's and row's
+    cell centers, so the distance tests read them instead of recomputing them per cell.
+    All arithmetic stays in float32: the arrays are float32, and the scalar arguments and
+    constants are cast once, so no expression is silently promoted to float64.
+    The grid geometry (cell_size, tile_cells and the grid shapes) is passed in at runtime
+    rather than baked in as compile-time constants. Specializing on it measured no faster, and
+    the on-disk cache only checks this file, so it would keep stale constants after an edit.
+    """
+    # Bounding boxes are computed in single precision, like the NumPy version did.
+    # Multiplying by the reciprocal is cheaper than dividing. A box may be off by one cell only
+    # where a circle just touches a cell's edge, and that cell's center is outside the circle.
+    inv_cell = np.float32(1.0 / cell_size)
+    cell_area = np.float32(cell_size * cell_size)
+    height_resolution = np.float32(height_resolution)
+    max_gx_limit = light_grid.shape[0] - 1
+    max_gy_limit = light_grid.shape[1] - 1
+    tiles_y = (light_grid.shape[1] + tile_cells - 1) // tile_cells
+
+    # --- Find what changed since the last update, and flag the tiles it touches ---
+    if full_rebuild:
+        dirty_tiles[:] = True
+    for k in range(removed_bounds.shape[0]):
+        _mark_tiles(removed_bounds, k, dirty_tiles, tiles_y, tile_cells)
+    # Plants don't move, so a box only changes when the snapshot of its radii does.
+    # Each plant writes only its own row, and marking tiles only ever stores True, so the
+    # refresh runs in parallel too.
+    for i in prange(count):
+        pending = raster_pending[i]
+        if not (pending or full_rebuild or
+                abs(radii[i] - raster_radii[i]) > redraw_threshold or
+                abs(root_radii[i] - raster_root_radii[i]) > redraw_threshold or
+                abs(heights[i] - raster_heights[i]) > redraw_threshold):
+            continue
+        # The tiles under the old snapshot must be redrawn without it.
+        if not pending and raster_radii[i] > 0:
+            _mark_tiles(bounds, i, dirty_tiles, tiles_y, tile_cells)
+        raster_radii[i] = radii[i]
+        raster_root_radii[i] = root_radii[i]
+        raster_heights[i] = heights[i]
+        raster_pending[i] = False
+        if radii[i] <= 0: continue
+        _grid_bounds(xs[i], ys[i], radii[i], inv_cell, max_gx_limit, max_gy_limit, bounds, i, 0)
+        _grid_bounds(xs[i], ys[i], root_radii[i], inv_cell, max_gx_limit, max_gy_limit, bounds, i, 4)
+        _mark_tiles(bounds, i, dirty_tiles, tiles_y, tile_cells)
+
+    # --- Phase 1: Populate the grids (parallel over grid tiles, since plants overlap the same cells) ---
+    tile_starts, tile_bounds = _rasterize_tiled(xs, ys, raster_radii, raster_heights, raster_root_radii, count,
+                                                light_grid, root_grid, cell_centers_x, cell_centers_y, inv_cell,
+                                                height_resolution, bounds, tile_cells, dirty_tiles)
+
+    # --- Phase 2: Read the grids back (the grids are read-only now, so plants run in parallel) ---
+    for i in prange(count):
+        radius = raster_radii[i]
+        if radius <= 0:
+            shaded_canopy_areas[i] = 0.0
+            overlapped_root_areas[i] = 0.0
+            continue
+
+        # Nothing this plant can see was redrawn, so its last results still hold.
+        if not _touches_dirty_tile(tile_bounds, i, dirty_tiles, tiles_y): continue
+
+        # A plant alone in every tile it touches can neither be shaded nor have its roots
+        # competed for, so the common case of an isolated plant skips both grid reads.
+        if _is_alone_in_tiles(tile_bounds, i, tile_starts, tiles_y):
+            shaded_canopy_areas[i] = 0.0
+            overlapped_root_areas[i] = 0.0
+            continue
+
+        x = xs[i]
+        y = ys[i]
+        height = _quantize_height(raster_heights[i], height_resolution)
+        root_radius = raster_root_radii[i]
+
+        # A canopy cell is shaded when a taller plant covers it.
+        # Circles under half a cell read their single cell the same way phase 1 wrote it.
+        radius_sq = radius * radius
+        shaded_cells = 0
+        if radius * inv_cell < HALF:
+            gx, gy = _small_circle_cell(x, y, radius_sq, inv_cell, cell_centers_x, cell_centers_y,
+                                        bounds[i, 0], bounds[i, 1], bounds[i, 2], bounds[i, 3])
+            if gx >= 0:
+                shaded_cells += height < light_grid[gx, gy]
+        else:
+            for gx in range(bounds[i, 0], bounds[i, 1] + 1):
+                dx = x - cell_centers_x[gx]
+                first_gy, last_gy = _column_span(dx * dx, y, radius_sq, cell_centers_y, bounds[i, 2], bounds[i, 3], inv_cell)
+                for gy in range(first_gy, last_gy + 1):
+                    shaded_cells += height < light_grid[gx, gy]
+
+        # A root cell is competed for when other roots add to the pressure there.
+        root_radius_sq = root_radius * root_radius
+        overlap_ratio_sum = ZERO
+        if root_radius * inv_cell < HALF:
+            gx, gy = _small_circle_cell(x, y, root_radius_sq, inv_cell, cell_centers_x, cell_centers_y,
+                                        bounds[i, 4], bounds[i, 5], bounds[i, 6], bounds[i, 7])
+            if gx >= 0:
+                overlap_ratio_sum += _overlap_ratio(root_grid[gx, gy], root_radius)
+        else:
+            for gx in range(bounds[i, 4], bounds[i, 5] + 1):
+                dx = x - cell_centers_x[gx]
+                first_gy, last_gy = _column_span(dx * dx, y, root_radius_sq, cell_centers_y, bounds[i, 6], bounds[i, 7], inv_cell)
+                for gy in range(first_gy, last_gy + 1):
+                    overlap_ratio_sum += _overlap_ratio(root_grid[gx, gy], root_radius)
+
+        # Clamp values to be safe
+        shaded_canopy_areas[i] = min(np.float32(shaded_cells) * cell_area, radius_sq * PI)
+        overlapped_root_areas[i] = min(overlap_ratio_sum * cell_area, root_radius_sq * PI)
+
+    dirty_tiles[:] = False
@@ -0,0 +1,150 @@
+#competition_numpy.py
+
+import numpy as np
+
+def _grid_bounds(x, y, radius, inv_cell, max_gx_limit, max_gy_limit):
+    """Returns the clamped grid-cell bounding boxes of many circles as (min_gx, max_gx, min_gy, max_gy) columns."""
+    return np.stack((np.maximum(0, (x - radius) * inv_cell).astype(np.int32),
+                     np.minimum(max_gx_limit, (x + radius) * inv_cell).astype(np.int32),
+                     np.maximum(0, (y - radius) * inv_cell).astype(np.int32),
+                     np.minimum(max_gy_limit, (y + radius) * inv_cell).astype(np.int32)), axis=1)
+
+# A persistent 0, 1, 2, ... range that every call slices into, instead of allocating a new one.
+# Like the PlantManager arrays, it doubles in size whenever a call needs more entries.
+_index_range = np.arange(1024, dtype=np.int64)
+_index_range.flags.writeable = False
+
+def _get_index_range(size):
+    """Returns a read-only view of the first size entries of the shared index range."""
+    global _index_range
+    if size > len(_index_range):
+        new_capacity = len(_index_range)
+        while new_capacity < size:
+            new_capacity *= 2
+        _index_range = np.arange(new_capacity, dtype=np.int64)
+        _index_range.flags.writeable = False
+    return _index_range[:size]
+
+def _expand_circles(indices, boxes, xs, ys, radii, cell_centers_x, cell_centers_y, inv_cell):
+    """
+    Lists every grid cell inside the given circles as flat arrays, one entry per (plant, cell) pair.
+    Like the compiled kernel, each circle is cut into one span of cells per column of its box,
+    solved from the circle's half-width there, so cells outside the circle are never listed
+    and need no distance test.
+    Entries are grouped by plant in index order, so the .at calls below see each cell's updates
+    in the same order as the compiled kernel does.
+    """
+    # One entry per (plant, column), without a Python loop over the plants.
+    # A circle entirely outside the grid has an empty (inverted) box after clamping.
+    box_widths = np.maximum(0, boxes[:, 1] - boxes[:, 0] + 1).astype(np.int64)
+    column_ids = np.repeat(indices, box_widths)
+    column_offsets = _get_index_range(box_widths.sum()) - np.repeat(np.cumsum(box_widths) - box_widths, box_widths)
+    column_gx = np.repeat(boxes[:, 0], box_widths) + column_offsets
+
+    # The span of cell centers within each column's half-width of the circle's center (see _column_span).
+    dx = xs[column_ids] - cell_centers_x[column_gx]
+    radius_sq = radii[column_ids] * radii[column_ids]
+    remaining = radius_sq - dx * dx
+    half_width = np.sqrt(np.maximum(remaining, 0))
+    y = ys[column_ids]
+    box_min_gy = np.repeat(boxes[:, 2], box_widths)
+    box_max_gy = np.repeat(boxes[:, 3], box_widths)
+    first_gy = np.maximum(box_min_gy, np.ceil((y - half_width) * inv_cell - 0.5).astype(np.int64))
+    last_gy = np.minimum(box_max_gy, np.floor((y + half_width) * inv_cell - 0.5).astype(np.int64))
+    span_lengths = np.where(remaining < 0, 0, np.maximum(0, last_gy - first_gy + 1))
+
+    # Circles under half a cell only test the center of the cell they sit in (see _small_circle_cell).
+    small = np.flatnonzero(radii[column_ids] * inv_cell < 0.5)
+    if len(small):
+        center_gy = (y[small] * inv_cell).astype(np.int64)
+        in_box = ((column_gx[small] == (xs[column_ids[small]] * inv_cell).astype(np.int64)) &
+                  (center_gy >= box_min_gy[small]) & (center_gy <= box_max_gy[small]))
+        center_gy = np.where(in_box, center_gy, box_min_gy[small]) # Keeps the lookup below in range.
+        dy = y[small] - cell_centers_y[center_gy]
+        first_gy[small] = center_gy
+        span_lengths[small] = in_box & (dx[small] * dx[small] + dy * dy <= radius_sq[small])
+
+    # Then one entry per cell of each span.
+    plant_ids = np.repeat(column_ids, span_lengths)
+    gx = np.repeat(column_gx, span_lengths)
+    cell_offsets = _get_index_range(span_lengths.sum()) - np.repeat(np.cumsum(span_lengths) - span_lengths, span_lengths)
+    gy = np.repeat(first_gy, span_lengths) + cell_offsets
+    return plant_ids, gx, gy
+
+def compute_plant_competition(xs, ys, radii, heights, root_radii, raster_radii, raster_heights, raster_root_radii,
+                              raster_pending, bounds, count, removed_bounds, dirty_tiles, full_rebuild, redraw_threshold,
+                              light_grid, root_grid, cell_size, cell_centers_x, cell_centers_y, height_resolution, tile_cells,
+                              shaded_canopy_areas, overlapped_root_areas):
+    """
+    A NumPy version of competition.compute_plant_competition, used when Numba is not installed.
+    It takes the same arguments and fills the same outputs. Instead of looping over plants, it
+    lists every covered cell of every plant at once, then updates the grids with one
+    np.maximum.at and one np.add.at call.
+    Circles are cut into cells with the kernel's own span and small-circle rules, so both
+    versions fill identical grids.
+    Plants are drawn with the same geometry snapshots as in the compiled kernel, but the grids
+    are always redrawn in full, so removed_bounds, tile_cells and the tile flags go unused.
+    """
+    inv_cell = np.float32(1.0 / cell_size)
+    cell_area = cell_size * cell_size
+    max_gx_limit = light_grid.shape[0] - 1
+    max_gy_limit = light_grid.shape[1] - 1
+
+    xs = xs[:count]
+    ys = ys[:count]
+
+    # Refresh the snapshots (and cached boxes) of plants that drifted far enough, like the kernel does.
+    changed = raster_pending[:count] | full_rebuild
+    changed |= np.abs(radii[:count] - raster_radii[:count]) > redraw_threshold
+    changed |= np.abs(root_radii[:count] - raster_root_radii[:count]) > redraw_threshold
+    changed |= np.abs(heights[:count] - raster_heights[:count]) > redraw_threshold
+    changed = np.flatnonzero(changed)
+    raster_radii[changed] = radii[changed]
+    raster_root_radii[changed] = root_radii[changed]
+    raster_heights[changed] = heights[changed]
+    raster_pending[changed] = False
+    dirty_tiles[:] = False
+
+    radii = raster_radii[:count]
+    root_radii = raster_root_radii[:count]
+    heights = raster_heights[:count]
+    changed = changed[radii[changed] > 0]
+    if len(changed):
+        x = xs[changed]
+        y = ys[changed]
+        bounds[changed, 0:4] = _grid_bounds(x, y, radii[changed], inv_cell, max_gx_limit, max_gy_limit)
+        bounds[changed, 4:8] = _grid_bounds(x, y, root_radii[changed], inv_cell, max_gx_limit, max_gy_limit)
+
+    light_grid.fill(0)
+    root_grid.fill(0)
+    shaded_canopy_areas[:count] = 0.0
+    overlapped_root_areas[:count] = 0.0
+    alive = np.flatnonzero(radii > 0)
+    if len(alive) == 0:
+        return
+
+    # Heights in the light grid's uint16 fixed-point units.
+    quantized_heights = np.minimum(65535, (heights / height_resolution + 0.5).astype(np.int64)).astype(light_grid.dtype)
+
+    canopy_ids, canopy_gx, canopy_gy = _expand_circles(alive, bounds[alive, 0:4], xs, ys, radii, cell_centers_x, cell_centers_y, inv_cell)
+    root_ids, root_gx, root_gy = _expand_circles(alive, bounds[alive, 4:8], xs, ys, root_radii, cell_centers_x, cell_centers_y, inv_cell)
+
+    # --- Phase 1: Populate the grids in one batched call each ---
+    np.maximum.at(light_grid, (canopy_gx, canopy_gy), quantized_heights[canopy_ids])
+    np.add.at(root_grid, (root_gx, root_gy), root_radii[root_ids])
+
+    # --- Phase 2: Read the grids back and total the results per plant ---
+    shaded = quantized_heights[canopy_ids] < light_grid[canopy_gx, canopy_gy]
+    shaded_cells = np.bincount(canopy_ids[shaded], minlength=count)
+
+    pressure = root_grid[root_gx, root_gy]
+    own_root_radius = root_radii[root_ids]
+    competed = pressure > own_root_radius
+    overlap_ratios = (pressure[competed] - own_root_radius[competed]) / pressure[competed]
+    overlap_ratio_sums = np.bincount(root_ids[competed], weights=overlap_ratios, minlength=count)
+
+    # Clamp values to be safe
+    radius_sq = radii[alive] * radii[alive]
+    root_radius_sq = root_radii[alive] * root_radii[alive]
+    shaded_canopy_areas[alive] = np.minimum(shaded_cells[alive] * cell_area, radius_sq * np.float32(np.pi))
+    overlapped_root_areas[alive] = np.minimum(overlap_ratio_sums[alive] * cell_area, root_radius_sq * np.float32(np.pi))
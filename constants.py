@@ -1,5 +1,6 @@
 # constants.py
 
+import os
 import numpy as np
 
 # =============================================================================
@@ -13,6 +14,11 @@ QUADTREE_CAPACITY = 4
 MILLISECONDS_PER_SECOND = 1000.0
 PROFILER_PRINT_LINE_COUNT = 20
 UI_LOADING_BAR_UPDATE_INTERVAL = 10
+PREGENERATION_WORKER_COUNT = 0 # Worker processes used to pre-generate chunks. 0 uses every CPU core, 1 disables multiprocessing.
+PREGENERATION_CHUNKS_PER_TASK = 8 # Chunks handed to a worker process at a time.
+# Pre-generated chunk textures are saved in this directory, so later launches load them instead of
+# regenerating the noise. The file name encodes everything that shapes the textures. None disables it.
+CHUNK_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "eco-system-evolution")
 SECONDS_PER_DAY = 86400
 SECONDS_PER_HOUR = 3600
 SECONDS_PER_MINUTE = 60
@@ -60,6 +66,9 @@ CAMERA_ZOOM_SPEED = 0.1
 CAMERA_MAX_ZOOM = 1.0
 CAMERA_MIN_ZOOM = 0.008
 UI_LOG_INTERVAL_SECONDS = 2592000.0
+UI_CULLING_MARGIN_PIXELS = 2 # Extra on-screen margin for fixed-size markers (seeds, flowers) when culling.
+UI_CULLING_FULL_LIST_VIEW_FRACTION = 0.9 # When the view covers at least this fraction of the world, draw from the creature lists instead of querying the quadtree.
+UI_SPRITE_CACHE_MAX_ENTRIES = 4096 # The plant sprite cache is cleared once it holds this many surfaces.
 GRAPHING_DATA_LOG_INTERVAL_SECONDS = 86400.0 # Log data for the graph once per sim-day.
 COLOR_WHITE = (255, 255, 255); COLOR_GREEN = (0, 255, 0); COLOR_BLUE = (0, 0, 255)
 COLOR_BLACK = (0, 0, 0); COLOR_VOID = (10, 0, 20)
@@ -96,6 +105,15 @@ UI_LOADING_BAR_HEIGHT = 30
 # Unit: Centimeters (cm)
 LIGHT_GRID_CELL_SIZE_CM = 50.0
 
+# The light grid stores canopy heights as uint16 in steps of this size, so the tallest storable
+# height is 65535 steps (about 164 m). Plants whose heights round to the same step do not shade each other.
+# Unit: Centimeters (cm)
+LIGHT_GRID_HEIGHT_RESOLUTION_CM = 0.25
+
+# The competition grids are filled in square tiles of this many cells per side, so the part of
+# the grid being written stays in the CPU cache. 64x64 float32 cells is 16 KB per grid.
+COMPETITION_GRID_TILE_CELLS = 64
+
 # =============================================================================
 # --- PHYSICS & BIOLOGY CONSTANTS (REAL-WORLD VALUES) ---
 # =============================================================================
@@ -292,15 +310,30 @@ PLANT_GROWTH_INVESTMENT_ENERGY_RESERVE = 10000.0
 # This is a heavy calculation, so it should not be run frequently. Once a day is a reasonable starting point.
 PLANT_COMPETITION_UPDATE_INTERVAL_SECONDS = 86400.0 # (1 Day)
 
+# The interval (in sim seconds) at which the plant arrays are re-sorted into Morton (Z-curve) order,
+# so plants that are close in the world are also close in memory. It runs alongside a competition update.
+PLANT_SPATIAL_SORT_INTERVAL_SECONDS = 2592000.0 # (30 Days)
+
+# The competition grids are redrawn incrementally: a plant is only redrawn once its radius, root radius
+# or height has drifted more than this many cm (a fiftieth of a grid cell) from the values it was last drawn with.
+PLANT_COMPETITION_REDRAW_THRESHOLD_CM = 1.0
+# The interval (in sim seconds) at which every plant is redrawn anyway, so small changes are never ignored for long.
+PLANT_COMPETITION_FULL_REBUILD_INTERVAL_SECONDS = 2592000.0 # (30 Days)
+
 # The interval (in sim seconds) at which a plant runs its main logic loop.
 # This is the fixed, discrete time-step for all biological calculations.
 PLANT_LOGIC_UPDATE_INTERVAL_SECONDS = 3600.0 # (1 Hour)
+SCHEDULER_WHEEL_SLOT_COUNT = 256 # Buckets in each scheduler's ring; updates scheduled further ahead than this many intervals go to an overflow dict.
 
 # The efficiency of the self-pruning process. 1.0 means the plant sheds
 # exactly enough biomass to cover its energy deficit for that tick.
 # Unit: Unitless
 PLANT_PRUNING_EFFICIENCY = 1.0
 
+# A plant that prunes its canopy radius below this collapses and dies.
+# Unit: Centimeters (cm)
+PLANT_MIN_CANOPY_RADIUS_CM = 0.1
+
 # --- Initial Properties & Size ---
 # The initial radius of a seedling's canopy and roots right after sprouting.
 # Unit: Centimeters (cm)
@@ -3,15 +3,61 @@
 import pygame
 import constants as C
 import random
+from itertools import compress
 import numpy as np
 from quadtree import Rectangle
 from genes import PlantGenes
 import logger as log
+try:
+    from plant_growth import update_growing_plants, growth_parameters, DEATH_CAUSES
+except ImportError:
+    # Numba is missing, so every plant runs through Plant.update one at a time instead.
+    update_growing_plants = None
 
 def lerp_color(c1, c2, t):
     t = max(0, min(1, t))
     return tuple(int(start + (end - start) * t) for start, end in zip(c1, c2))
 
+# Sprites are cached by everything that affects their pixels, so a plant only costs a
+# lookup and a blit per frame instead of a fresh Surface and several draw calls.
+_sprite_cache = {}
+
+def _cache_sprite(key, sprite):
+    if len(_sprite_cache) >= C.UI_SPRITE_CACHE_MAX_ENTRIES:
+        _sprite_cache.clear()
+    _sprite_cache[key] = sprite
+    return sprite
+
+def _get_marker_sprite(color, radius):
+    """Returns an opaque filled circle, matching pygame.draw.circle on the screen."""
+    key = ("marker", color, radius)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        size = radius * 2 + 1
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        # Drawing straight onto the (alpha-less) screen ignores the color's alpha, so the sprite is opaque too.
+        pygame.draw.circle(sprite, (*color[:3], 255), (radius, radius), radius)
+        sprite = _cache_sprite(key, sprite)
+    return sprite
+
+def _get_plant_sprite(canopy_radius, canopy_color, core_radius):
+    """Returns a sprite with the translucent canopy and the opaque core drawn on top of it."""
+    key = (canopy_radius, canopy_color, core_radius)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        half_size = max(canopy_radius, core_radius)
+        sprite = pygame.Surface((half_size * 2, half_size * 2), pygame.SRCALPHA)
+        if canopy_radius:
+            # The canopy used to live on its own 2r x 2r surface, so it is clipped to that box.
+            offset = half_size - canopy_radius
+            sprite.set_clip(pygame.Rect(offset, offset, canopy_radius * 2, canopy_radius * 2))
+            pygame.draw.circle(sprite, canopy_color, (half_size, half_size), canopy_radius)
+            sprite.set_clip(None)
+        if core_radius:
+            pygame.draw.circle(sprite, (*C.COLOR_PLANT_CORE[:3], 255), (half_size, half_size), core_radius)
+        sprite = _cache_sprite(key, sprite)
+    return sprite
+
 class ReproductiveOrgan:
     """A simple data class to represent a flower or a fruit on a plant."""
     def __init__(self, parent_plant):
@@ -37,6 +83,9 @@ class ReproductiveOrgan:
         return self.type == "fruit" and self.age > C.PLANT_FRUIT_LIFESPAN_SECONDS
 
 class Creature:
+    # A plain class attribute is cheaper to test than isinstance() on every hot-path check.
+    is_plant = False
+
     def __init__(self, x, y, initial_energy=C.CREATURE_INITIAL_ENERGY):
         self.x = x  # World coordinate, in centimeters (cm)
         self.y = y  # World coordinate, in centimeters (cm)
@@ -44,6 +93,7 @@ class Creature:
         self.age = 0  # Age of the creature, in seconds (s)
         self.is_alive = True
         self.id = random.randint(C.CREATURE_ID_MIN, C.CREATURE_ID_MAX)
+        self.quadtree_node = None # The quadtree node holding this creature, set by QuadTree.insert.
 
     def die(self, world, cause):
         if self.is_alive:
@@ -62,6 +112,8 @@ class Creature:
         return None
 
 class Plant(Creature):
+    is_plant = True
+
     def __init__(self, world, x, y, initial_energy=C.CREATURE_INITIAL_ENERGY):
         super().__init__(x, y, initial_energy)
         self.genes = PlantGenes()
@@ -85,8 +137,7 @@ class Plant(Creature):
         self.competition_factor = 1.0 # DEPRECATED, will be removed later.
         self.competition_update_accumulator = 0.0 # Time since last competition check, in seconds (s)
         self.has_reached_self_sufficiency = False # Has the plant ever had a positive energy balance?
-        self.shaded_canopy_area = 0.0 # The area of our canopy shaded by neighbors, in cm^2
-        self.overlapped_root_area = 0.0 # The area of our roots competing with neighbors, in cm^2
+        # The shaded canopy area and overlapped root area live only in the PlantManager's arrays.
         self.core_growth_since_crush_check = 0.0 # Accumulated core radius growth for crush check, in cm
         self.last_graph_log_time = -1.0 # The sim time of the last data log for graphing.
 
@@ -103,6 +154,26 @@ class Plant(Creature):
         self.humidity = world.environment.get_humidity(self.x, self.y)
         # self.environment_eff is now removed. The value is calculated in bulk by PlantManager.
 
+    # --- World bookkeeping hooks, called by the world's housekeeping so it needs no type checks ---
+    def add_to_world(self, world):
+        world.plant_manager.add_plant(self)
+        self._note_radius_change(world, 0.0)
+
+    def remove_from_world(self, world):
+        world.plant_manager.remove_plant(self)
+        self._note_radius_change(world, self.radius)
+
+    def _note_radius_change(self, world, old_radius):
+        """
+        Keeps the world's cached largest plant radius current. A plant growing past it simply
+        becomes the new largest; only when the plant that set it shrinks or leaves does the
+        cache need a full rescan, so it is flagged for one.
+        """
+        if self.radius > world.max_plant_radius:
+            world.max_plant_radius = self.radius
+        elif old_radius >= world.max_plant_radius:
+            world.plant_manager.max_radius_dirty = True
+
     def get_personal_space_radius(self):
         return self.core_radius * C.PLANT_CORE_PERSONAL_SPACE_FACTOR
 
@@ -122,10 +193,10 @@ class Plant(Creature):
         idx = self.index
 
         # 1. Aging Efficiency
-        pm.arrays['aging_efficiencies'][idx] = np.exp(-(self.age / C.PLANT_SENESCENCE_TIMESCALE_SECONDS))
+        pm.aging_efficiencies[idx] = np.exp(-(self.age / C.PLANT_SENESCENCE_TIMESCALE_SECONDS))
 
         # 2. Hydraulic Efficiency
-        pm.arrays['hydraulic_efficiencies'][idx] = np.exp(-(self.height / C.PLANT_MAX_HYDRAULIC_HEIGHT_CM))
+        pm.hydraulic_efficiencies[idx] = np.exp(-(self.height / C.PLANT_MAX_HYDRAULIC_HEIGHT_CM))
 
         # 3. Environmental Efficiency
         temp = self.temperature # Already cached on the plant object
@@ -135,7 +206,7 @@ class Plant(Creature):
         hum_diff = np.abs(hum - self.genes.optimal_humidity)
         hum_eff = np.exp(-((hum_diff / self.genes.humidity_tolerance)**2))
         environmental_efficiency = temp_eff * hum_eff
-        pm.arrays['environmental_efficiencies'][idx] = environmental_efficiency
+        pm.environmental_efficiencies[idx] = environmental_efficiency
 
         # 4. Soil Efficiency (replaces the old, single patch)
         max_soil_eff = self.genes.soil_efficiency.get(self.soil_type, 0)
@@ -144,7 +215,7 @@ class Plant(Creature):
         # At sprouting, there is no root competition.
         root_competition_eff = 1.0
         soil_efficiency = max_soil_eff * ratio_modifier * root_competition_eff
-        pm.arrays['soil_efficiencies'][idx] = soil_efficiency
+        pm.soil_efficiencies[idx] = soil_efficiency
 
         # 5. Metabolism Cost
         canopy_area = np.pi * self.radius**2
@@ -154,21 +225,21 @@ class Plant(Creature):
         temp_difference = temp - C.PLANT_RESPIRATION_REFERENCE_TEMP
         respiration_factor = C.PLANT_Q10_FACTOR ** (temp_difference / C.PLANT_Q10_INTERVAL_DIVISOR)
         metabolism_cost_per_second = total_area * C.PLANT_BASE_MAINTENANCE_RESPIRATION_PER_AREA * respiration_factor
-        pm.arrays['metabolism_costs_per_second'][idx] = metabolism_cost_per_second
-        pm.arrays['canopy_areas'][idx] = canopy_area # Also patch the cached canopy area
+        pm.metabolism_costs_per_second[idx] = metabolism_cost_per_second
+        pm.canopy_areas[idx] = canopy_area # Also patch the cached canopy area
 
         # 6. Photosynthesis Gain
         # At sprouting, there is no shade.
         effective_canopy_area = canopy_area
-        aging_efficiency = pm.arrays['aging_efficiencies'][idx]
-        hydraulic_efficiency = pm.arrays['hydraulic_efficiencies'][idx]
+        aging_efficiency = pm.aging_efficiencies[idx]
+        hydraulic_efficiency = pm.hydraulic_efficiencies[idx]
         photosynthesis_gain_per_second = (effective_canopy_area *
                                           C.PLANT_PHOTOSYNTHESIS_PER_AREA *
                                           environmental_efficiency *
                                           soil_efficiency *
                                           aging_efficiency *
                                           hydraulic_efficiency)
-        pm.arrays['photosynthesis_gains_per_second'][idx] = photosynthesis_gain_per_second
+        pm.photosynthesis_gains_per_second[idx] = photosynthesis_gain_per_second
 
     def _update_seed(self, world, time_step, is_debug_focused):
         """Logic for when the plant is a dormant seed."""
@@ -176,7 +247,7 @@ class Plant(Creature):
         # --- 1. Dormancy Metabolism ---
         dormancy_cost = (C.PLANT_DORMANCY_METABOLISM_J_PER_HOUR / C.SECONDS_PER_HOUR) * time_step
         self.energy -= dormancy_cost
-        pm.arrays['energies'][self.index] = self.energy
+        pm.energies[self.index] = self.energy
 
         if self.energy <= 0:
             if is_debug_focused: log.log(f"DEBUG ({self.id}): Seed ran out of energy.")
@@ -190,18 +261,21 @@ class Plant(Creature):
         if temp_ok and humidity_ok:
             if self.energy >= C.PLANT_SPROUTING_ENERGY_COST:
                 self.energy -= C.PLANT_SPROUTING_ENERGY_COST
-                pm.arrays['energies'][self.index] = self.energy
+                pm.energies[self.index] = self.energy
                 self.life_stage = "seedling"
-                self.radius = C.PLANT_SPROUT_RADIUS_CM
-                self.root_radius = C.PLANT_SPROUT_RADIUS_CM
-                self.core_radius = C.PLANT_SPROUT_CORE_RADIUS_CM
+                old_radius = self.radius
+                # Sizes are single precision from the start, like the PlantManager's arrays, so the
+                # seedling's growth has the same rounding whether it runs here or in the batched kernel.
+                self.radius = np.float32(C.PLANT_SPROUT_RADIUS_CM)
+                self.root_radius = np.float32(C.PLANT_SPROUT_RADIUS_CM)
+                self.core_radius = np.float32(C.PLANT_SPROUT_CORE_RADIUS_CM)
                 self.height = self.radius * self.radius_to_height_factor # Use instance variable
                 
                 # Update all manager arrays with new seedling values
-                pm.arrays['heights'][self.index] = self.height
-                pm.arrays['radii'][self.index] = self.radius
-                pm.arrays['root_radii'][self.index] = self.root_radius
-                pm.arrays['core_radii'][self.index] = self.core_radius
+                pm.heights[self.index] = self.height
+                pm.set_radii(self.index, self.radius, self.root_radius)
+                self._note_radius_change(world, old_radius)
+                pm.core_radii[self.index] = self.core_radius
 
                 # --- NEW COMPREHENSIVE PATCH ---
                 # Immediately calculate and patch all vital rates for the new seedling
@@ -229,15 +303,20 @@ class Plant(Creature):
             - core_area (float): The calculated core area, in cm^2.
         """
         # --- 1. Calculate current physical state ---
-        canopy_area = np.pi * self.radius**2
-        root_area = np.pi * self.root_radius**2
-        core_area = np.pi * self.core_radius**2
+        # Squares are plain products: NumPy's float32 power can differ from them in the last bit,
+        # and the batched kernel in plant_growth.py must reproduce these values exactly.
+        canopy_area = np.pi * (self.radius * self.radius)
+        root_area = np.pi * (self.root_radius * self.root_radius)
+        core_area = np.pi * (self.core_radius * self.core_radius)
 
         # --- 2. Adapt morphology based on competition ---
-        shade_ratio = (self.shaded_canopy_area / canopy_area) if canopy_area > 0 else 0
+        # The competition results are read from the PlantManager's arrays, where the global update writes them.
+        shaded_canopy_area = world.plant_manager.shaded_canopy_areas[self.index]
+        shade_ratio = (shaded_canopy_area / canopy_area) if canopy_area > 0 else 0
         if is_debug_focused:
-            root_overlap_percent = (self.overlapped_root_area / root_area * 100) if root_area > 0 else 0
-            log.log(f"    Competition: Shaded Area={self.shaded_canopy_area:.2f} ({shade_ratio*100:.1f}%), Root Overlap={self.overlapped_root_area:.2f} ({root_overlap_percent:.1f}%)")
+            overlapped_root_area = world.plant_manager.overlapped_root_areas[self.index]
+            root_overlap_percent = (overlapped_root_area / root_area * 100) if root_area > 0 else 0
+            log.log(f"    Competition: Shaded Area={shaded_canopy_area:.2f} ({shade_ratio*100:.1f}%), Root Overlap={overlapped_root_area:.2f} ({root_overlap_percent:.1f}%)")
 
         target_factor = C.PLANT_RADIUS_TO_HEIGHT_FACTOR + (C.PLANT_MAX_SHADE_RADIUS_TO_HEIGHT_FACTOR - C.PLANT_RADIUS_TO_HEIGHT_FACTOR) * shade_ratio
         self.radius_to_height_factor += (target_factor - self.radius_to_height_factor) * C.PLANT_MORPHOLOGY_ADAPTATION_RATE
@@ -247,26 +326,26 @@ class Plant(Creature):
 
         # --- 3. Calculate all efficiency multipliers ---
         # Get pre-calculated efficiencies from the PlantManager's NumPy arrays.
-        soil_eff = world.plant_manager.arrays['soil_efficiencies'][self.index]
-        aging_efficiency = world.plant_manager.arrays['aging_efficiencies'][self.index]
-        hydraulic_efficiency = world.plant_manager.arrays['hydraulic_efficiencies'][self.index]
+        soil_eff = world.plant_manager.soil_efficiencies[self.index]
+        aging_efficiency = world.plant_manager.aging_efficiencies[self.index]
+        hydraulic_efficiency = world.plant_manager.hydraulic_efficiencies[self.index]
         
         # --- 4. Calculate energy gain (Photosynthesis) ---
         # Look up the pre-calculated gain rate and scale it by the time step.
-        photosynthesis_gain_per_second = world.plant_manager.arrays['photosynthesis_gains_per_second'][self.index]
+        photosynthesis_gain_per_second = world.plant_manager.photosynthesis_gains_per_second[self.index]
         photosynthesis_gain = photosynthesis_gain_per_second * time_step
         
         # --- 5. Calculate energy loss (Metabolism) ---
-        metabolism_cost_per_second = world.plant_manager.arrays['metabolism_costs_per_second'][self.index]
+        metabolism_cost_per_second = world.plant_manager.metabolism_costs_per_second[self.index]
         metabolism_cost = metabolism_cost_per_second * time_step
         
         if is_debug_focused:
             # Re-calculate effective_canopy_area here just for the debug log.
             # The main calculation now uses the pre-computed value.
-            shaded_canopy_area = world.plant_manager.arrays['shaded_canopy_areas'][self.index]
+            shaded_canopy_area = world.plant_manager.shaded_canopy_areas[self.index]
             effective_canopy_area = max(0, canopy_area - shaded_canopy_area)
 
-            environmental_efficiency = world.plant_manager.arrays['environmental_efficiencies'][self.index]
+            environmental_efficiency = world.plant_manager.environmental_efficiencies[self.index]
             log.log(f"    Energy Calc: Effective Canopy={effective_canopy_area:.2f} (Total: {canopy_area:.2f})")
             # The 'Root Comp Eff' is now implicitly included in the 'Soil' efficiency value.
             
@@ -286,7 +365,7 @@ class Plant(Creature):
         This function does not return a value; it only modifies the plant's state.
         """
         total_sheddable_area = canopy_area + root_area + core_area
-        metabolism_cost_per_second = world.plant_manager.arrays['metabolism_costs_per_second'][self.index]
+        metabolism_cost_per_second = world.plant_manager.metabolism_costs_per_second[self.index]
 
         if total_sheddable_area > 0:
             maintenance_cost_per_area_tick = (metabolism_cost_per_second / total_sheddable_area) * time_step
@@ -313,16 +392,17 @@ class Plant(Creature):
                 new_root_area = max(0, root_area - shed_root_area)
                 new_core_area = max(0, core_area - shed_core_area)
                 
+                old_radius = self.radius
                 self.radius = np.sqrt(new_canopy_area / np.pi)
                 self.root_radius = np.sqrt(new_root_area / np.pi)
                 self.core_radius = np.sqrt(new_core_area / np.pi)
                 self.height = self.radius * self.radius_to_height_factor
 
                 pm = world.plant_manager
-                pm.arrays['heights'][self.index] = self.height
-                pm.arrays['radii'][self.index] = self.radius
-                pm.arrays['root_radii'][self.index] = self.root_radius
-                pm.arrays['core_radii'][self.index] = self.core_radius
+                pm.heights[self.index] = self.height
+                pm.set_radii(self.index, self.radius, self.root_radius)
+                pm.core_radii[self.index] = self.core_radius
+                self._note_radius_change(world, old_radius)
 
                 if is_debug_focused:
                     log.log(f"      - New Radii: Canopy={self.radius:.2f}, Core={self.core_radius:.2f}.")
@@ -334,6 +414,7 @@ class Plant(Creature):
         """
         # 1. Mature plants invest in creating flowers.
         # --- TEMPORARY DEBUG FLAG TO DISABLE REPRODUCTION ---
+        # (The batched update in plant_growth.py leaves this step out as well.)
         if self.life_stage == "mature" and False:
             desired_repro_investment = (C.PLANT_REPRODUCTIVE_INVESTMENT_J_PER_HOUR / C.SECONDS_PER_HOUR) * time_step
             available_for_repro = max(0, self.energy - C.PLANT_GROWTH_INVESTMENT_ENERGY_RESERVE)
@@ -344,7 +425,7 @@ class Plant(Creature):
                 self.energy -= actual_repro_investment
                 # No need to update the manager array here, it will be done once at the end of the main update.
                 self.reproductive_energy_stored += actual_repro_investment
-                pm.arrays['reproductive_energies_stored'][self.index] = self.reproductive_energy_stored
+                pm.reproductive_energies_stored[self.index] = self.reproductive_energy_stored
                 
                 num_new_flowers = int(self.reproductive_energy_stored // C.PLANT_FLOWER_ENERGY_COST)
                 max_flowers = int(canopy_area * C.PLANT_MAX_FLOWERS_PER_CANOPY_AREA)
@@ -354,7 +435,7 @@ class Plant(Creature):
                 if num_new_flowers > 0:
                     cost_of_flowers = num_new_flowers * C.PLANT_FLOWER_ENERGY_COST
                     self.reproductive_energy_stored -= cost_of_flowers
-                    pm.arrays['reproductive_energies_stored'][self.index] = self.reproductive_energy_stored
+                    pm.reproductive_energies_stored[self.index] = self.reproductive_energy_stored
                     for _ in range(num_new_flowers):
                         self.reproductive_organs.append(ReproductiveOrgan(self))
                     if is_debug_focused:
@@ -417,17 +498,17 @@ class Plant(Creature):
                 core_investment = effective_growth_energy * C.PLANT_STABLE_CORE_INVESTMENT_RATIO
                 canopy_root_investment = effective_growth_energy * (1.0 - C.PLANT_STABLE_CORE_INVESTMENT_RATIO)
 
-            soil_eff = world.plant_manager.arrays['soil_efficiencies'][self.index]
-            environmental_efficiency = world.plant_manager.arrays['environmental_efficiencies'][self.index]
+            soil_eff = world.plant_manager.soil_efficiencies[self.index]
+            environmental_efficiency = world.plant_manager.environmental_efficiencies[self.index]
             total_limitation = environmental_efficiency + soil_eff
             if total_limitation > 0:
                 old_core_radius = self.core_radius
 
                 if core_investment > 0:
                     added_core_area = core_investment / C.PLANT_CORE_BIOMASS_ENERGY_COST
-                    new_core_area = (np.pi * self.core_radius**2) + added_core_area
+                    new_core_area = (np.pi * (self.core_radius * self.core_radius)) + added_core_area
                     self.core_radius = np.sqrt(new_core_area / np.pi)
-                    world.plant_manager.arrays['core_radii'][self.index] = self.core_radius
+                    world.plant_manager.core_radii[self.index] = self.core_radius
 
                 if canopy_root_investment > 0:
                     added_biomass_area = canopy_root_investment / C.PLANT_BIOMASS_ENERGY_COST
@@ -437,15 +518,16 @@ class Plant(Creature):
                     added_root_area = added_biomass_area * root_alloc_factor
                     
                     new_canopy_area = canopy_area + added_canopy_area
+                    old_radius = self.radius
                     self.radius = np.sqrt(new_canopy_area / np.pi)
-                    world.plant_manager.arrays['radii'][self.index] = self.radius
 
                     new_root_area = root_area + added_root_area
                     self.root_radius = np.sqrt(new_root_area / np.pi)
-                    world.plant_manager.arrays['root_radii'][self.index] = self.root_radius
+                    world.plant_manager.set_radii(self.index, self.radius, self.root_radius)
+                    self._note_radius_change(world, old_radius)
 
                     self.height = self.radius * self.radius_to_height_factor
-                    world.plant_manager.arrays['heights'][self.index] = self.height
+                    world.plant_manager.heights[self.index] = self.height
                 
                 if is_debug_focused:
                     log.log(f"      - Growth: New Radius={self.radius:.2f}, New Core Radius={self.core_radius:.2f}")
@@ -454,24 +536,31 @@ class Plant(Creature):
                     self.core_growth_since_crush_check += self.core_radius - old_core_radius
                     
                     if self.core_growth_since_crush_check >= C.PLANT_CRUSH_CHECK_GROWTH_THRESHOLD_CM:
-                        search_area = Rectangle(self.x, self.y, self.core_radius, self.core_radius)
-                        neighbors = world.quadtree.query(search_area, [])
-                        for neighbor in neighbors:
-                            if neighbor is self or not isinstance(neighbor, Plant) or not neighbor.is_alive:
-                                continue
-                            
-                            dist_sq = (self.x - neighbor.x)**2 + (self.y - neighbor.y)**2
-                            if dist_sq < self.core_radius**2:
-                                neighbor_is_debug_focused = (world.debug_focused_creature_id == neighbor.id)
-                                if is_debug_focused or neighbor_is_debug_focused:
-                                    log.log(f"DEATH ({neighbor.id}): Crushed by the growing core of Plant ID {self.id}.")
-                                neighbor.die(world, "core_crush")
-                        
+                        self._crush_neighbors(world, is_debug_focused)
                         self.core_growth_since_crush_check = 0.0
 
             elif is_debug_focused:
                 log.log(f"      - Decision: CANNOT GROW (Total limitation factor is zero).")
 
+    def _crush_neighbors(self, world, is_debug_focused):
+        """Kills every other plant whose center lies inside this plant's core."""
+        search_area = Rectangle(self.x, self.y, self.core_radius, self.core_radius)
+        neighbors = world.quadtree.query(search_area, [])
+        # The crushing circle is the same for every neighbor, so it is read into locals once.
+        x, y = self.x, self.y
+        core_radius_sq = self.core_radius * self.core_radius
+        for neighbor in neighbors:
+            if neighbor is self or not neighbor.is_plant or not neighbor.is_alive:
+                continue
+            
+            dx = x - neighbor.x
+            dy = y - neighbor.y
+            if dx * dx + dy * dy < core_radius_sq:
+                neighbor_is_debug_focused = (world.debug_focused_creature_id == neighbor.id)
+                if is_debug_focused or neighbor_is_debug_focused:
+                    log.log(f"DEATH ({neighbor.id}): Crushed by the growing core of Plant ID {self.id}.")
+                neighbor.die(world, "core_crush")
+
     def _update_growing_plant(self, world, time_step, is_debug_focused):
         """Unified logic for seedlings and mature plants."""
         if is_debug_focused:
@@ -485,10 +574,10 @@ class Plant(Creature):
             net_energy_per_hour = net_energy_production / (time_step / C.SECONDS_PER_HOUR)
             pm = world.plant_manager
             idx = self.index
-            aging_eff = pm.arrays['aging_efficiencies'][idx]
-            hydraulic_eff = pm.arrays['hydraulic_efficiencies'][idx]
-            env_eff = pm.arrays['environmental_efficiencies'][idx]
-            soil_eff = pm.arrays['soil_efficiencies'][idx]
+            aging_eff = pm.aging_efficiencies[idx]
+            hydraulic_eff = pm.hydraulic_efficiencies[idx]
+            env_eff = pm.environmental_efficiencies[idx]
+            soil_eff = pm.soil_efficiencies[idx]
             world.graphing_manager.add_data_point(
                 world.time_manager.total_sim_seconds, net_energy_per_hour, self.height, self.radius,
                 canopy_area, root_area, core_area, self.energy, aging_eff, hydraulic_eff, env_eff, soil_eff
@@ -508,7 +597,7 @@ class Plant(Creature):
             energy_deficit_this_tick = abs(net_energy_production)
             self._process_self_pruning(energy_deficit_this_tick, canopy_area, root_area, core_area, world, time_step, is_debug_focused)
             
-            if self.radius < 0.1:
+            if self.radius < C.PLANT_MIN_CANOPY_RADIUS_CM:
                 if is_debug_focused: log.log(f"DEATH ({self.id}): Plant pruned itself into non-existence.")
                 self.die(world, "pruning_collapse")
                 return
@@ -519,7 +608,7 @@ class Plant(Creature):
 
         # --- 5. Finalize State & Check for Starvation ---
         # Sync the final, post-spending energy value to the manager array.
-        world.plant_manager.arrays['energies'][self.index] = self.energy
+        world.plant_manager.energies[self.index] = self.energy
 
         if is_debug_focused:
             log.log(f"    Energy: Gained={photosynthesis_gain:.4f}, Lost={metabolism_cost:.4f}, Net={net_energy_production:.4f}, Final Stored={self.energy:.2f}")
@@ -540,7 +629,7 @@ class Plant(Creature):
 
         self.age += time_step
         # --- Update the master 'ages' array in the manager ---
-        world.plant_manager.arrays['ages'][self.index] = self.age
+        world.plant_manager.ages[self.index] = self.age
         
         is_debug_focused = (world.debug_focused_creature_id == self.id)
 
@@ -571,7 +660,7 @@ class Plant(Creature):
                             new_seed = self._disperse_seed(world, fruit, is_debug_focused)
                             if new_seed:
                                 self.energy -= C.PLANT_SEED_PROVISIONING_ENERGY
-                                world.plant_manager.arrays['energies'][self.index] = self.energy
+                                world.plant_manager.energies[self.index] = self.energy
                                 world.add_newborn(new_seed)
                         else:
                             if is_debug_focused: log.log(f"    REPRODUCTION: Fruit dropped, but not enough energy to provision a seed. Aborting further dispersal.")
@@ -582,9 +671,9 @@ class Plant(Creature):
 
         # This check happens at the very end of the update, after all growth and pruning.
         if self.is_alive and self.life_stage != "seed":
-            final_canopy_area = np.pi * self.radius**2
+            final_canopy_area = np.pi * (self.radius * self.radius)
             if final_canopy_area > 1.0: # Only check for non-trivial plants
-                final_core_area = np.pi * self.core_radius**2
+                final_core_area = np.pi * (self.core_radius * self.core_radius)
                 final_ratio = final_core_area / final_canopy_area
                 if final_ratio < C.PLANT_MIN_CORE_TO_CANOPY_RATIO:
                     if is_debug_focused:
@@ -594,6 +683,77 @@ class Plant(Creature):
         if is_debug_focused:
             log.log(f"--- END LOGIC {self.id} --- Final Energy: {self.energy:.2f}")
 
+    @staticmethod
+    def update_batch(world, plants, time_step):
+        """
+        Updates a bucket of plants, with the same results as calling update() on each in turn.
+        The arithmetic of every sprouted plant runs at once in a compiled kernel (see
+        plant_growth.py). What touches Python objects (deaths, crushing, life stages, the cached
+        largest radius) is then applied plant by plant in bucket order, as update() would.
+        Seeds, the debug-focused plant, plants born this frame (which get their PlantManager
+        row only at housekeeping) and plants carrying reproductive organs (which the kernel
+        does not age or drop) still go through update() itself.
+        """
+        if update_growing_plants is None:
+            for plant in plants:
+                plant.update(world, time_step)
+            return
+
+        focused_id = world.debug_focused_creature_id
+        batched = [plant.is_alive and plant.life_stage != "seed" and plant.index >= 0 and plant.id != focused_id
+                   and not plant.reproductive_organs for plant in plants]
+        batch = list(compress(plants, batched))
+        count = len(batch)
+
+        pm = world.plant_manager
+        indices = np.fromiter((plant.index for plant in batch), dtype=np.intp, count=count)
+        factors = np.fromiter((plant.radius_to_height_factor for plant in batch), dtype=np.float32, count=count)
+        crush_growths = np.fromiter((plant.core_growth_since_crush_check for plant in batch), dtype=np.float32, count=count)
+        new_energies = np.empty(count, dtype=np.float32)
+        old_radii = np.empty(count, dtype=np.float32)
+        radius_changed = np.empty(count, dtype=np.bool_)
+        crush_due = np.empty(count, dtype=np.bool_)
+        net_gains = np.empty(count, dtype=np.bool_)
+        death_causes = np.empty(count, dtype=np.int8)
+        if count:
+            update_growing_plants(indices, growth_parameters(time_step), pm.energies, pm.radii, pm.root_radii,
+                                  pm.core_radii, pm.heights, pm.shaded_canopy_areas, pm.photosynthesis_gains_per_second,
+                                  pm.metabolism_costs_per_second, pm.soil_efficiencies, pm.environmental_efficiencies,
+                                  factors, crush_growths, new_energies, old_radii, radius_changed, crush_due,
+                                  net_gains, death_causes)
+
+        ages, radii, root_radii, core_radii, heights = pm.ages, pm.radii, pm.root_radii, pm.core_radii, pm.heights
+        results = zip(new_energies, factors, crush_growths, old_radii, radius_changed.tolist(), crush_due.tolist(),
+                      net_gains.tolist(), death_causes.tolist())
+        for plant, is_batched in zip(plants, batched):
+            if not is_batched:
+                plant.update(world, time_step)
+                continue
+            energy, factor, crush_growth, old_radius, changed, crush, net_gain, death_cause = next(results)
+            # A plant crushed earlier in this bucket is skipped, as update() would skip it.
+            # Its rows were already written by the kernel, but they are removed at housekeeping.
+            if not plant.is_alive: continue
+
+            index = plant.index
+            plant.age += time_step
+            ages[index] = plant.age
+            plant.energy = energy
+            plant.radius_to_height_factor = factor
+            plant.core_growth_since_crush_check = crush_growth
+            plant.radius = radii[index]
+            plant.root_radius = root_radii[index]
+            plant.core_radius = core_radii[index]
+            plant.height = heights[index]
+            if changed:
+                plant._note_radius_change(world, old_radius)
+            if crush:
+                plant._crush_neighbors(world, False)
+            if net_gain and not plant.has_reached_self_sufficiency:
+                plant.has_reached_self_sufficiency = True
+                plant.life_stage = "mature"
+            if death_cause:
+                plant.die(world, DEATH_CAUSES[death_cause])
+
     def _disperse_seed(self, world, fruit, is_debug_focused):
         """
         Handles the 'fall and roll' physics for a dropped fruit to find a new seed location.
@@ -656,7 +816,7 @@ class Plant(Creature):
         search_area = Rectangle(final_x, final_y, C.PLANT_CORE_PERSONAL_SPACE_FACTOR, C.PLANT_CORE_PERSONAL_SPACE_FACTOR)
         neighbors = world.quadtree.query(search_area, [])
         for neighbor in neighbors:
-            if isinstance(neighbor, Plant):
+            if neighbor.is_plant:
                 dist_sq = (final_x - neighbor.x)**2 + (final_y - neighbor.y)**2
                 if dist_sq < neighbor.get_personal_space_radius()**2:
                     if is_debug_focused: log.log(f"      - Dispersal FAILED: Seed landed too close to neighbor {neighbor.id}'s core.")
@@ -667,30 +827,63 @@ class Plant(Creature):
         return Plant(world, final_x, final_y, initial_energy=C.PLANT_SEED_PROVISIONING_ENERGY)
 
     def draw(self, screen, camera):
-        screen_pos = camera.world_to_screen(self.x, self.y)
+        blit_sequence = []
+        self.add_blits(camera, blit_sequence)
+        screen.blits(blit_sequence, doreturn=False)
 
-        if self.life_stage == "seed":
-            # Draw a small, visible marker for seeds
-            pygame.draw.circle(screen, C.COLOR_PLANT_SEED, screen_pos, 2)
-            return
+    def add_blits(self, camera, blit_sequence):
+        """Appends this plant's (sprite, position) pairs to blit_sequence (see add_batch_blits)."""
+        Plant.add_batch_blits((self,), camera, blit_sequence)
 
-        canopy_radius = camera.scale(self.radius)
-        if canopy_radius >= 1:
-            canopy_surface = pygame.Surface((canopy_radius * 2, canopy_radius * 2), pygame.SRCALPHA)
-            health_ratio = min(1.0, max(0.0, self.energy / C.CREATURE_REPRODUCTION_ENERGY_COST))
-            canopy_color = lerp_color(C.COLOR_PLANT_CANOPY_SICKLY, C.COLOR_PLANT_CANOPY_HEALTHY, health_ratio)
-            pygame.draw.circle(canopy_surface, canopy_color, (canopy_radius, canopy_radius), canopy_radius)
-            screen.blit(canopy_surface, (screen_pos[0] - canopy_radius, screen_pos[1] - canopy_radius))
-        core_radius = camera.scale(self.core_radius)
-        if core_radius >= 1:
-            pygame.draw.circle(screen, C.COLOR_PLANT_CORE, screen_pos, core_radius)
-            
-        # --- Draw flowers and fruits ---
-        for organ in self.reproductive_organs:
-            organ_pos = camera.world_to_screen(self.x + organ.relative_x, self.y + organ.relative_y)
-            organ_radius = 2 # Fixed pixel size for visibility
-            color = C.COLOR_PLANT_FLOWER if organ.type == "flower" else C.COLOR_PLANT_FRUIT
-            pygame.draw.circle(screen, color, organ_pos, organ_radius)
+    @staticmethod
+    def add_batch_blits(plants, camera, blit_sequence):
+        """
+        Appends the (sprite, position) pairs of many plants to blit_sequence, in the order of
+        plants, so the world can hand every visible plant to a single screen.blits() call.
+        This runs for every visible plant on every frame, so the camera's transform is inlined
+        (with the same arithmetic as camera.world_to_screen and camera.scale) and everything
+        shared by the plants is looked up once, before the loop.
+        """
+        camera_x, camera_y, zoom = camera.x, camera.y, camera.zoom
+        half_screen_width = C.SCREEN_WIDTH / 2
+        half_screen_height = C.SCREEN_HEIGHT / 2
+        full_health_energy = C.CREATURE_REPRODUCTION_ENERGY_COST
+        sickly_color = C.COLOR_PLANT_CANOPY_SICKLY
+        healthy_color = C.COLOR_PLANT_CANOPY_HEALTHY
+        # Draw a small, visible marker for seeds
+        seed_sprite = _get_marker_sprite(C.COLOR_PLANT_SEED, 2)
+        append = blit_sequence.append
+
+        for plant in plants:
+            screen_x = int((plant.x - camera_x) * zoom + half_screen_width)
+            screen_y = int((plant.y - camera_y) * zoom + half_screen_height)
+
+            if plant.life_stage == "seed":
+                append((seed_sprite, (screen_x - 2, screen_y - 2)))
+                continue
+
+            canopy_radius = int(plant.radius * zoom)
+            core_radius = int(plant.core_radius * zoom)
+            if canopy_radius >= 1:
+                health_ratio = min(1.0, max(0.0, plant.energy / full_health_energy))
+                canopy_color = lerp_color(sickly_color, healthy_color, health_ratio)
+            else:
+                canopy_radius = 0
+                canopy_color = None
+            if core_radius < 1:
+                core_radius = 0
+            if canopy_radius or core_radius:
+                sprite = _get_plant_sprite(canopy_radius, canopy_color, core_radius)
+                half_size = max(canopy_radius, core_radius)
+                append((sprite, (screen_x - half_size, screen_y - half_size)))
+
+            # --- Draw flowers and fruits ---
+            for organ in plant.reproductive_organs:
+                organ_x, organ_y = camera.world_to_screen(plant.x + organ.relative_x, plant.y + organ.relative_y)
+                organ_radius = 2 # Fixed pixel size for visibility
+                color = C.COLOR_PLANT_FLOWER if organ.type == "flower" else C.COLOR_PLANT_FRUIT
+                sprite = _get_marker_sprite(color, organ_radius)
+                append((sprite, (organ_x - organ_radius, organ_y - organ_radius)))
 
 class Animal(Creature):
     def __init__(self, x, y):
@@ -699,15 +892,34 @@ class Animal(Creature):
         self.height = C.ANIMAL_INITIAL_HEIGHT_CM  # Height of the animal, in centimeters (cm)
         self.color = C.COLOR_BLUE
         self.target_plant = None
+        self.list_index = -1 # Position in world.animals, kept current for swap-and-pop removal.
+
+    # --- World bookkeeping hooks, called by the world's housekeeping so it needs no type checks ---
+    def add_to_world(self, world):
+        self.list_index = len(world.animals)
+        world.animals.append(self)
+
+    def remove_from_world(self, world):
+        """Removes this animal from world.animals by moving the last animal into its slot."""
+        if self.list_index < 0: return
+        animals = world.animals
+        last_animal = animals.pop()
+        if last_animal is not self:
+            animals[self.list_index] = last_animal
+            last_animal.list_index = self.list_index
+        self.list_index = -1
 
     def find_closest_plant(self, quadtree):
         search_area = Rectangle(self.x, self.y, C.ANIMAL_SIGHT_RADIUS_CM, C.ANIMAL_SIGHT_RADIUS_CM)
         nearby_creatures = quadtree.query(search_area, [])
         closest_plant = None
         min_dist = float('inf')
+        x, y = self.x, self.y
         for plant in nearby_creatures:
-            if isinstance(plant, Plant) and plant.is_alive:
-                dist_sq = (self.x - plant.x)**2 + (self.y - plant.y)**2
+            if plant.is_plant and plant.is_alive:
+                dx = x - plant.x
+                dy = y - plant.y
+                dist_sq = dx * dx + dy * dy
                 if dist_sq < min_dist:
                     min_dist = dist_sq
                     closest_plant = plant
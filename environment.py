@@ -1,12 +1,41 @@
 #environment.py
 
+import hashlib
+import multiprocessing
+import os
+import signal
 import pygame
 import numpy as np
 import noise
 import constants as C
+import numpy_noise
 from numpy_noise import perlin_noise_2d
 import logger as log
 
+# Constants whose values can change a chunk texture. The disk cache file is named after them.
+_CHUNK_TEXTURE_CONSTANT_PREFIXES = ("WORLD_", "CHUNK_SIZE", "CHUNK_RESOLUTION", "NOISE_", "TERRAIN_", "TEMP_", "HUMIDITY_", "COLOR_")
+
+# --- Multiprocessing chunk generation ---
+# Each worker process builds its own Environment once. Its permutation table is
+# seeded from the same constants, so it produces exactly the same noise as the main process.
+_worker_environment = None
+
+def _init_chunk_worker():
+    """Pool initializer: creates the Environment used by this worker process."""
+    global _worker_environment
+    # Forked workers inherit SDL's SIGTERM handler from pygame.init(), which ignores the
+    # signal, so Pool.terminate() would wait on them forever. Restore the default action.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _worker_environment = Environment()
+
+def _generate_chunk_color_arrays_worker(chunk_coords):
+    """
+    Pool task: generates the color arrays of a chunk for ALL view modes.
+    Only plain NumPy arrays are returned, since pygame surfaces can't be sent between processes.
+    """
+    chunk_x, chunk_y = chunk_coords
+    return chunk_x, chunk_y, _worker_environment._generate_chunk_color_arrays_all_modes(chunk_x, chunk_y)
+
 class Environment:
     def __init__(self):
         self.temp_seed = C.TEMP_NOISE_SEED
@@ -124,32 +153,131 @@ class Environment:
         colors[:] = (1 - t) * np.array(C.COLOR_DRY) + t * np.array(C.COLOR_WET)
         return np.transpose(colors, (1, 0, 2))
 
-    def _generate_chunk_texture(self, chunk_x, chunk_y):
+    def _get_chunk_world_grid(self, chunk_x, chunk_y):
+        """Returns the world-coordinate sample grid (wx_grid, wy_grid) for a chunk."""
         wx = np.linspace(chunk_x * C.CHUNK_SIZE_CM, (chunk_x + 1) * C.CHUNK_SIZE_CM, C.CHUNK_RESOLUTION)
         wy = np.linspace(chunk_y * C.CHUNK_SIZE_CM, (chunk_y + 1) * C.CHUNK_SIZE_CM, C.CHUNK_RESOLUTION)
-        wx_grid, wy_grid = np.meshgrid(wx, wy)
-        if self.view_mode == "terrain":
-            noise_values = perlin_noise_2d(
-                self.p, wx_grid / C.NOISE_SCALE, wy_grid / C.NOISE_SCALE,
-                octaves=C.NOISE_OCTAVES, persistence=C.NOISE_PERSISTENCE, lacunarity=C.NOISE_LACUNARITY
-            )
+        return np.meshgrid(wx, wy)
+
+    def _get_noise_offset(self, view_mode):
+        """Returns the coordinate offset (seed) used to sample the noise field of a view mode."""
+        if view_mode == "terrain": return 0
+        elif view_mode == "temperature": return self.temp_seed
+        else: return self.humidity_seed # humidity
+
+    def _get_color_array(self, view_mode, noise_values):
+        """Converts raw noise values of a view mode into its color array."""
+        if view_mode == "terrain":
             values = ((noise_values + 1) / 2) ** C.TERRAIN_AMPLITUDE
-            color_array = self._get_terrain_color_vectorized(values)
-        elif self.view_mode == "temperature":
-            noise_values = perlin_noise_2d(
-                self.p, (wx_grid + self.temp_seed) / C.NOISE_SCALE, (wy_grid + self.temp_seed) / C.NOISE_SCALE,
-                octaves=C.NOISE_OCTAVES, persistence=C.NOISE_PERSISTENCE, lacunarity=C.NOISE_LACUNARITY
-            )
+            return self._get_terrain_color_vectorized(values)
+        elif view_mode == "temperature":
             values = (noise_values + 1) / 2
-            color_array = self._get_temperature_color_vectorized(values)
+            return self._get_temperature_color_vectorized(values)
         else: # humidity
-            noise_values = perlin_noise_2d(
-                self.p, (wx_grid + self.humidity_seed) / C.NOISE_SCALE, (wy_grid + self.humidity_seed) / C.NOISE_SCALE,
-                octaves=C.NOISE_OCTAVES, persistence=C.NOISE_PERSISTENCE, lacunarity=C.NOISE_LACUNARITY
-            )
             values = (noise_values + 1) / 2
-            color_array = self._get_humidity_color_vectorized(values)
-        return pygame.surfarray.make_surface(color_array)
+            return self._get_humidity_color_vectorized(values)
+
+    def _generate_chunk_texture(self, chunk_x, chunk_y, view_mode):
+        wx_grid, wy_grid = self._get_chunk_world_grid(chunk_x, chunk_y)
+        offset = self._get_noise_offset(view_mode)
+        noise_values = perlin_noise_2d(
+            self.p, (wx_grid + offset) / C.NOISE_SCALE, (wy_grid + offset) / C.NOISE_SCALE,
+            octaves=C.NOISE_OCTAVES, persistence=C.NOISE_PERSISTENCE, lacunarity=C.NOISE_LACUNARITY
+        )
+        return pygame.surfarray.make_surface(self._get_color_array(view_mode, noise_values))
+
+    def _generate_chunk_color_arrays_all_modes(self, chunk_x, chunk_y):
+        """
+        Generates the color arrays of a chunk for ALL view modes at once.
+        The sample grid is built once, and the three noise fields are stacked
+        into a single perlin_noise_2d call instead of three separate ones.
+        Returns:
+            dict: A mapping of view mode to its color array.
+        """
+        view_modes = list(self.chunk_texture_cache.keys())
+        wx_grid, wy_grid = self._get_chunk_world_grid(chunk_x, chunk_y)
+        offsets = np.array([self._get_noise_offset(mode) for mode in view_modes]).reshape(-1, 1, 1)
+        noise_stack = perlin_noise_2d(
+            self.p, (wx_grid + offsets) / C.NOISE_SCALE, (wy_grid + offsets) / C.NOISE_SCALE,
+            octaves=C.NOISE_OCTAVES, persistence=C.NOISE_PERSISTENCE, lacunarity=C.NOISE_LACUNARITY
+        )
+        return {mode: self._get_color_array(mode, noise_stack[i]) for i, mode in enumerate(view_modes)}
+
+    def store_chunk_color_arrays(self, chunk_x, chunk_y, color_arrays):
+        """Converts a chunk's per-mode color arrays into surfaces and stores any missing ones in the texture cache."""
+        chunk_key = (chunk_x, chunk_y)
+        for view_mode, color_array in color_arrays.items():
+            if chunk_key not in self.chunk_texture_cache[view_mode]:
+                self.chunk_texture_cache[view_mode][chunk_key] = pygame.surfarray.make_surface(color_array)
+
+    def _get_chunk_disk_cache_path(self):
+        """
+        Returns the file that pre-generated chunk textures are cached in. Its name is a hash of
+        every constant that shapes the textures and of the code that generates them, so a
+        change to either simply misses the old file.
+        """
+        digest = hashlib.sha1()
+        for name in sorted(dir(C)):
+            if name.startswith(_CHUNK_TEXTURE_CONSTANT_PREFIXES):
+                digest.update(f"{name}={getattr(C, name)!r};".encode())
+        for source_path in (__file__, numpy_noise.__file__):
+            with open(source_path, "rb") as source:
+                digest.update(source.read())
+        return os.path.join(C.CHUNK_DISK_CACHE_DIR, f"chunks_{digest.hexdigest()[:16]}.npy")
+
+    def load_chunk_disk_cache(self, total_chunks_x, total_chunks_y):
+        """
+        Fills the texture cache for every view mode from the disk cache, if a matching one exists.
+        The file is memory-mapped and read one chunk at a time. Returns True if it was loaded.
+        """
+        if C.CHUNK_DISK_CACHE_DIR is None: return False
+        path = self._get_chunk_disk_cache_path()
+        if not os.path.exists(path): return False
+
+        view_modes = list(self.chunk_texture_cache.keys())
+        expected_shape = (total_chunks_x, total_chunks_y, len(view_modes), C.CHUNK_RESOLUTION, C.CHUNK_RESOLUTION, 3)
+        try:
+            cached = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as error:
+            log.log(f"Ignoring unreadable chunk cache '{path}': {error}")
+            return False
+        if cached.shape != expected_shape or cached.dtype != np.uint8:
+            log.log(f"Ignoring chunk cache '{path}' with shape {cached.shape}, expected {expected_shape}.")
+            return False
+
+        for chunk_x in range(total_chunks_x):
+            for chunk_y in range(total_chunks_y):
+                color_arrays = {mode: cached[chunk_x, chunk_y, i] for i, mode in enumerate(view_modes)}
+                self.store_chunk_color_arrays(chunk_x, chunk_y, color_arrays)
+        log.log(f"Loaded chunk textures from '{path}'.")
+        return True
+
+    def save_chunk_disk_cache(self, total_chunks_x, total_chunks_y):
+        """
+        Writes the texture cache for every view mode to the disk cache, for the next launch.
+        Every chunk must already be generated. Failing to write is logged, not raised.
+        """
+        if C.CHUNK_DISK_CACHE_DIR is None: return
+        path = self._get_chunk_disk_cache_path()
+        view_modes = list(self.chunk_texture_cache.keys())
+        shape = (total_chunks_x, total_chunks_y, len(view_modes), C.CHUNK_RESOLUTION, C.CHUNK_RESOLUTION, 3)
+        # The file is written under a temporary name and renamed into place, so an interrupted
+        # write never leaves a truncated file that a later launch would try to load.
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(C.CHUNK_DISK_CACHE_DIR, exist_ok=True)
+            cached = np.lib.format.open_memmap(temp_path, mode="w+", dtype=np.uint8, shape=shape)
+            for i, mode in enumerate(view_modes):
+                for (chunk_x, chunk_y), surface in self.chunk_texture_cache[mode].items():
+                    cached[chunk_x, chunk_y, i] = pygame.surfarray.pixels3d(surface)
+            cached.flush()
+            del cached
+            os.replace(temp_path, path)
+        except OSError as error:
+            log.log(f"Could not write chunk cache '{path}': {error}")
+            if os.path.exists(temp_path): os.remove(temp_path)
+            return
+        log.log(f"Saved chunk textures to '{path}'.")
 
     def toggle_view_mode(self):
         """Switches view and clears the scaled cache, as it's now invalid."""
@@ -159,11 +287,66 @@ class Environment:
         self.scaled_chunk_cache.clear()
         log.log(f"Event: View switched to '{self.view_mode}'. Scaled chunk cache cleared.")
 
-    def generate_chunk_if_needed(self, chunk_x, chunk_y):
-        """Generates a chunk for the CURRENT view mode if it's not in the main texture cache."""
-        current_cache = self.chunk_texture_cache[self.view_mode]
+    def generate_chunk_if_needed(self, chunk_x, chunk_y, view_mode=None):
+        """
+        Generates a chunk if it's not in the main texture cache.
+        Uses the CURRENT view mode unless a specific view_mode is given.
+        """
+        if view_mode is None: view_mode = self.view_mode
+        current_cache = self.chunk_texture_cache[view_mode]
         if (chunk_x, chunk_y) not in current_cache:
-            current_cache[(chunk_x, chunk_y)] = self._generate_chunk_texture(chunk_x, chunk_y)
+            current_cache[(chunk_x, chunk_y)] = self._generate_chunk_texture(chunk_x, chunk_y, view_mode)
+
+    def has_all_view_modes(self, chunk_x, chunk_y):
+        """Checks if a chunk is in the main texture cache for every view mode."""
+        chunk_key = (chunk_x, chunk_y)
+        return all(chunk_key in cache for cache in self.chunk_texture_cache.values())
+
+    def generate_all_view_modes_if_needed(self, chunk_x, chunk_y):
+        """Generates a chunk for ALL view modes if any of them is missing from the main texture cache."""
+        if self.has_all_view_modes(chunk_x, chunk_y): return
+        self.store_chunk_color_arrays(chunk_x, chunk_y, self._generate_chunk_color_arrays_all_modes(chunk_x, chunk_y))
+
+    def generate_chunks_for_all_view_modes(self, chunk_coords, worker_count):
+        """
+        Generates the given chunks for ALL view modes, spreading the noise generation
+        over a pool of worker processes when worker_count is greater than 1.
+        This is a generator: it yields each (chunk_x, chunk_y) once its textures are cached,
+        so the caller can keep the UI responsive while the work completes.
+        """
+        missing_chunks = []
+        for chunk_x, chunk_y in chunk_coords:
+            if self.has_all_view_modes(chunk_x, chunk_y):
+                yield chunk_x, chunk_y
+            else:
+                missing_chunks.append((chunk_x, chunk_y))
+
+        # With every chunk already cached (e.g. loaded from disk), no worker processes are started.
+        if not missing_chunks: return
+
+        if worker_count <= 1:
+            for chunk_x, chunk_y in missing_chunks:
+                self.generate_all_view_modes_if_needed(chunk_x, chunk_y)
+                yield chunk_x, chunk_y
+            return
+
+        # Noise generation is pure NumPy work, so separate processes sidestep the GIL.
+        # Surfaces are still created here, on the main process. The color arrays come back
+        # pickled; at about 90 KB per chunk that is negligible next to the noise itself.
+        worker_count = min(worker_count, len(missing_chunks))
+        pool = multiprocessing.Pool(worker_count, initializer=_init_chunk_worker)
+        try:
+            results = pool.imap_unordered(_generate_chunk_color_arrays_worker, missing_chunks, chunksize=C.PREGENERATION_CHUNKS_PER_TASK)
+            for chunk_x, chunk_y, color_arrays in results:
+                self.store_chunk_color_arrays(chunk_x, chunk_y, color_arrays)
+                yield chunk_x, chunk_y
+        except BaseException:
+            # The caller stopped early or a worker failed, so the remaining work is abandoned.
+            pool.terminate()
+            raise
+        # Every chunk is in, so the workers are left to exit on their own rather than signalled.
+        pool.close()
+        pool.join()
 
     def draw(self, screen, camera):
         """Draws the visible chunks, using a cache for scaled surfaces."""
@@ -194,10 +377,9 @@ class Environment:
                 
                 # --- NEW CACHING LOGIC ---
                 # Check if a pre-scaled version of this chunk is in our scaled cache.
-                if chunk_key in self.scaled_chunk_cache:
-                    # If yes, use it directly.
-                    scaled_chunk = self.scaled_chunk_cache[chunk_key]
-                else:
+                # One .get() replaces an 'in' test followed by an index, since this runs per chunk per frame.
+                scaled_chunk = self.scaled_chunk_cache.get(chunk_key)
+                if scaled_chunk is None:
                     # If no, get the original texture...
                     original_texture = current_texture_cache.get(chunk_key)
                     if not original_texture: continue
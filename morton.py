@@ -0,0 +1,19 @@
+#morton.py
+
+import numpy as np
+
+def spread_bits(values):
+    """Spreads the low 16 bits of each value so a zero bit sits between every pair of bits."""
+    v = values.astype(np.uint32) & 0x0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+def morton_codes(cells_x, cells_y):
+    """
+    Returns the Morton (Z-order) codes of integer cell coordinates, clipped to 0..0xFFFF.
+    The x bits go to the even positions and the y bits to the odd ones.
+    """
+    return spread_bits(np.clip(cells_x, 0, 0xFFFF)) | (spread_bits(np.clip(cells_y, 0, 0xFFFF)) << 1)
@@ -0,0 +1,171 @@
+#plant_growth.py
+
+import numpy as np
+from numba import njit, prange
+import constants as C
+
+# Causes of death reported by the kernel, by code. Code 0 means the plant survived.
+DEATH_CAUSES = (None, "pruning_collapse", "starvation", "structural_failure")
+_PRUNING_COLLAPSE = 1
+_STARVATION = 2
+_STRUCTURAL_FAILURE = 3
+
+ZERO = np.float32(0.0)
+ONE = np.float32(1.0)
+PI = np.float32(np.pi)
+
+def growth_parameters(time_step):
+    """
+    Returns the constants used by update_growing_plants, as a tuple of float32.
+    They are passed in rather than read as globals, because Numba would bake globals into its
+    on-disk cache, which is not invalidated when constants.py changes.
+    Each one is rounded to single precision exactly as Plant.update rounds it when it meets a
+    float32 value, so both versions do the same arithmetic.
+    """
+    return tuple(np.float32(value) for value in (
+        time_step,
+        C.PLANT_GROWTH_INVESTMENT_ENERGY_RESERVE,
+        C.PLANT_GROWTH_INVESTMENT_RATIO / C.SECONDS_PER_HOUR,
+        C.PLANT_RADIUS_TO_HEIGHT_FACTOR,
+        C.PLANT_MAX_SHADE_RADIUS_TO_HEIGHT_FACTOR - C.PLANT_RADIUS_TO_HEIGHT_FACTOR,
+        C.PLANT_MORPHOLOGY_ADAPTATION_RATE,
+        C.PLANT_PRUNING_EFFICIENCY,
+        C.PLANT_MIN_CANOPY_RADIUS_CM,
+        C.PLANT_GROWTH_EFFICIENCY_BIOMASS_THRESHOLD,
+        C.PLANT_IDEAL_CORE_TO_CANOPY_AREA_RATIO,
+        C.PLANT_STABLE_CORE_INVESTMENT_RATIO,
+        1.0 - C.PLANT_STABLE_CORE_INVESTMENT_RATIO,
+        C.PLANT_CORE_BIOMASS_ENERGY_COST,
+        C.PLANT_BIOMASS_ENERGY_COST,
+        C.PLANT_CRUSH_CHECK_GROWTH_THRESHOLD_CM,
+        C.PLANT_MIN_CORE_TO_CANOPY_RATIO,
+    ))
+
+@njit(cache=True)
+def _update_growing_plant(k, i, params, energies, radii, root_radii, core_radii, heights, shaded_canopy_areas,
+                          photosynthesis_gains_per_second, metabolism_costs_per_second, soil_efficiencies,
+                          environmental_efficiencies, factors, crush_growths, new_energies, old_radii,
+                          radius_changed, crush_due, net_gains, death_causes):
+    """Runs one hourly update for the k-th plant of the batch, whose PlantManager index is i."""
+    (time_step, reserve, growth_rate, base_factor, shade_factor_range, adaptation_rate, pruning_efficiency,
+     min_radius, growth_efficiency_threshold, ideal_core_ratio, stable_core_ratio, stable_rest_ratio, core_cost,
+     biomass_cost, crush_threshold, min_core_ratio) = params
+
+    radius = radii[i]
+    root_radius = root_radii[i]
+    core_radius = core_radii[i]
+    height = heights[i]
+    factor = factors[k]
+    radius_changed[k] = False
+    crush_due[k] = False
+    net_gains[k] = False
+    death_causes[k] = 0
+
+    # --- Energy balance (Plant._calculate_energy_balance) ---
+    canopy_area = PI * (radius * radius)
+    root_area = PI * (root_radius * root_radius)
+    core_area = PI * (core_radius * core_radius)
+    shade_ratio = shaded_canopy_areas[i] / canopy_area if canopy_area > ZERO else ZERO
+    target_factor = base_factor + shade_factor_range * shade_ratio
+    factor += (target_factor - factor) * adaptation_rate
+    net_energy = photosynthesis_gains_per_second[i] * time_step - metabolism_costs_per_second[i] * time_step
+    energy = np.float32(energies[i]) + net_energy
+
+    if energy < reserve and net_energy < ZERO:
+        # --- Energy deficit (Plant._process_self_pruning) ---
+        total_area = canopy_area + root_area + core_area
+        cost_per_area = (metabolism_costs_per_second[i] / total_area) * time_step if total_area > ZERO else ZERO
+        if cost_per_area > ZERO:
+            area_to_shed = (abs(net_energy) / cost_per_area) * pruning_efficiency
+            old_radii[k] = radius
+            radius_changed[k] = True
+            radius = np.sqrt(max(ZERO, canopy_area - area_to_shed * (canopy_area / total_area)) / PI)
+            root_radius = np.sqrt(max(ZERO, root_area - area_to_shed * (root_area / total_area)) / PI)
+            core_radius = np.sqrt(max(ZERO, core_area - area_to_shed * (core_area / total_area)) / PI)
+            height = radius * factor
+        if radius < min_radius:
+            death_causes[k] = _PRUNING_COLLAPSE
+    elif energy > reserve:
+        # --- Energy surplus (Plant._allocate_surplus_energy) ---
+        available_surplus = energy - reserve
+        growth_energy = available_surplus * growth_rate * time_step
+        if available_surplus < growth_energy:
+            growth_energy = available_surplus
+        energy -= growth_energy
+
+        if growth_energy > ZERO:
+            growth_efficiency = ONE / (ONE + ((canopy_area + root_area + core_area) / growth_efficiency_threshold))
+            effective_growth_energy = growth_energy * growth_efficiency
+            if canopy_area > ONE and core_area / canopy_area < ideal_core_ratio:
+                core_investment = effective_growth_energy
+                canopy_root_investment = ZERO
+            else:
+                core_investment = effective_growth_energy * stable_core_ratio
+                canopy_root_investment = effective_growth_energy * stable_rest_ratio
+
+            soil_efficiency = soil_efficiencies[i]
+            environmental_efficiency = environmental_efficiencies[i]
+            total_limitation = environmental_efficiency + soil_efficiency
+            if total_limitation > ZERO:
+                old_core_radius = core_radius
+                if core_investment > ZERO:
+                    new_core_area = PI * (core_radius * core_radius) + core_investment / core_cost
+                    core_radius = np.sqrt(new_core_area / PI)
+                if canopy_root_investment > ZERO:
+                    added_biomass_area = canopy_root_investment / biomass_cost
+                    added_canopy_area = added_biomass_area * (soil_efficiency / total_limitation)
+                    added_root_area = added_biomass_area * (environmental_efficiency / total_limitation)
+                    old_radii[k] = radius
+                    radius_changed[k] = True
+                    radius = np.sqrt((canopy_area + added_canopy_area) / PI)
+                    root_radius = np.sqrt((root_area + added_root_area) / PI)
+                    height = radius * factor
+                if core_radius > old_core_radius:
+                    crush_growths[k] += core_radius - old_core_radius
+                    if crush_growths[k] >= crush_threshold:
+                        crush_due[k] = True
+                        crush_growths[k] = ZERO
+
+    radii[i] = radius
+    root_radii[i] = root_radius
+    core_radii[i] = core_radius
+    heights[i] = height
+    factors[k] = factor
+    new_energies[k] = energy
+    if death_causes[k] == _PRUNING_COLLAPSE: return
+
+    energies[i] = energy
+    if energy <= ZERO:
+        death_causes[k] = _STARVATION
+        return
+    net_gains[k] = net_energy > ZERO
+
+    # --- Structural check at the end of Plant.update ---
+    final_canopy_area = PI * (radius * radius)
+    if final_canopy_area > ONE and PI * (core_radius * core_radius) / final_canopy_area < min_core_ratio:
+        death_causes[k] = _STRUCTURAL_FAILURE
+
+@njit(cache=True, parallel=True)
+def update_growing_plants(indices, params, energies, radii, root_radii, core_radii, heights, shaded_canopy_areas,
+                          photosynthesis_gains_per_second, metabolism_costs_per_second, soil_efficiencies,
+                          environmental_efficiencies, factors, crush_growths, new_energies, old_radii,
+                          radius_changed, crush_due, net_gains, death_causes):
+    """
+    Runs the arithmetic of Plant.update for a batch of sprouted plants, the k-th of which has
+    PlantManager index indices[k]. Each plant only reads and writes its own row, so they are
+    updated in parallel.
+    Sizes and energies are written straight into the PlantManager's arrays, and the shape
+    factors and crush growth accumulators (factors, crush_growths) are updated in place.
+    The rest is left for the caller to apply in order, since it touches Python objects: each
+    plant's new energy, its radius before a change (when radius_changed is set), whether its
+    core grew enough to crush its neighbors, whether it survived the energy checks with a
+    positive net energy (which makes a seedling mature), and its cause of death as an index
+    into DEATH_CAUSES.
+    It mirrors Plant.update operation for operation in single precision, without fastmath,
+    so both give bit-identical results. Any change to one must be made to the other.
+    """
+    for k in prange(len(indices)):
+        _update_growing_plant(k, indices[k], params, energies, radii, root_radii, core_radii, heights,
+                              shaded_canopy_areas, photosynthesis_gains_per_second, metabolism_costs_per_second,
+                              soil_efficiencies, environmental_efficiencies, factors, crush_growths,
+                              new_energies, old_radii, radius_changed, crush_due, net_gains, death_causes)
@@ -2,6 +2,7 @@
 import numpy as np
 import constants as C
 import logger as log
+from morton import morton_codes
 
 def calculate_environment_efficiency(temperature, humidity, genes):
     """Calculates environmental efficiency based on temperature and humidity."""
@@ -21,16 +22,25 @@ class PlantManager:
         initial_capacity = 1000
         self.capacity = initial_capacity
         self.count = 0
+        # Set whenever a radius change could move the largest radius; the world then rescans the array.
+        self.max_radius_dirty = True
+        # Grid bounds of plants removed since the last competition update, whose old cells must be redrawn.
+        self.removed_grid_bounds = []
 
         self.arrays = {
-            'ages': np.zeros(initial_capacity, dtype=np.float64),
+            # Ages only feed the senescence curve, so single precision is plenty and halves
+            # the bytes streamed per plant. The authoritative age stays on the Plant object.
+            'ages': np.zeros(initial_capacity, dtype=np.float32),
             'heights': np.zeros(initial_capacity, dtype=np.float32),
             'radii': np.zeros(initial_capacity, dtype=np.float32),
             'root_radii': np.zeros(initial_capacity, dtype=np.float32),
             'core_radii': np.zeros(initial_capacity, dtype=np.float32),
+            # Energies stay in double precision: they accumulate many small per-step deltas.
             'energies': np.zeros(initial_capacity, dtype=np.float64),
             'reproductive_energies_stored': np.zeros(initial_capacity, dtype=np.float64),
-            'positions': np.zeros((initial_capacity, 2), dtype=np.float32),
+            # Positions are split into one array per axis, so a pass that reads only x streams only x.
+            'xs': np.zeros(initial_capacity, dtype=np.float32),
+            'ys': np.zeros(initial_capacity, dtype=np.float32),
             'soil_type_ids': np.zeros(initial_capacity, dtype=np.int8), # Stores soil type as an integer ID
             'overlapped_root_areas': np.zeros(initial_capacity, dtype=np.float32), # From competition calculation
             'shaded_canopy_areas': np.zeros(initial_capacity, dtype=np.float32), # From competition calculation
@@ -41,7 +51,26 @@ class PlantManager:
             'photosynthesis_gains_per_second': np.zeros(initial_capacity, dtype=np.float32),
             'metabolism_costs_per_second': np.zeros(initial_capacity, dtype=np.float32),
             'canopy_areas': np.zeros(initial_capacity, dtype=np.float32), # Caches the result of pi * r^2
+            # The geometry each plant was last drawn into the competition grids with. It is only
+            # refreshed once the live value drifts far enough, so most updates redraw few cells.
+            'raster_radii': np.zeros(initial_capacity, dtype=np.float32),
+            'raster_root_radii': np.zeros(initial_capacity, dtype=np.float32),
+            'raster_heights': np.zeros(initial_capacity, dtype=np.float32),
+            'raster_pending': np.ones(initial_capacity, dtype=np.bool_), # Set for plants not yet drawn at all.
+            # Competition grid bounding boxes of the drawn geometry, cached between global updates:
+            # the canopy box in columns 0-3 and the root box in 4-7, each as (min_gx, max_gx, min_gy, max_gy).
+            'grid_bounds': np.zeros((initial_capacity, 8), dtype=np.int32),
         }
+        self._bind_array_views()
+
+    def _bind_array_views(self):
+        """
+        Exposes every managed array as an attribute of the same name (pm.energies, pm.xs, ...).
+        Hot per-plant code reads these directly, skipping the dict lookup. They are references,
+        so they cost no memory, but they must be rebound whenever the arrays are reallocated.
+        """
+        for key, arr in self.arrays.items():
+            setattr(self, key, arr)
 
     def add_plant(self, plant):
         """Adds a new plant, linking it to the NumPy arrays via its index."""
@@ -59,25 +88,38 @@ class PlantManager:
         self.arrays['core_radii'][self.count] = plant.core_radius
         self.arrays['energies'][self.count] = plant.energy
         self.arrays['reproductive_energies_stored'][self.count] = plant.reproductive_energy_stored
-        self.arrays['positions'][self.count] = (plant.x, plant.y)
+        self.arrays['xs'][self.count] = plant.x
+        self.arrays['ys'][self.count] = plant.y
         
         # Look up the soil type string from the plant and store its corresponding ID.
         soil_id = C.PLANT_SOIL_TYPE_TO_ID[plant.soil_type]
         self.arrays['soil_type_ids'][self.count] = soil_id
 
+        self.arrays['raster_pending'][self.count] = True
+
+        # A new plant has no competition until the next global update. The slot may still
+        # hold the values of a plant that was removed, so clear them explicitly.
+        self.arrays['shaded_canopy_areas'][self.count] = 0.0
+        self.arrays['overlapped_root_areas'][self.count] = 0.0
+
         # Explicitly set the initial energy in the array upon registration.
         # This makes the array's state correct from the very first moment.
         self.arrays['energies'][self.count] = plant.energy
 
         self.count += 1
 
+    def set_radii(self, index, radius, root_radius):
+        """Stores a plant's new canopy and root radii. The competition update notices the change itself."""
+        self.arrays['radii'][index] = radius
+        self.arrays['root_radii'][index] = root_radius
+
     def _grow_capacity(self):
         """Doubles the capacity of all NumPy arrays within the self.arrays dictionary."""
         new_capacity = self.capacity * 2
         log.log(f"DEBUG: PlantManager growing from {self.capacity} to {new_capacity}")
 
         for key, arr in self.arrays.items():
-            # Special handling for 2D arrays like 'positions'
+            # Special handling for 2D arrays like 'grid_bounds'
             if arr.ndim == 2:
                 new_shape = (new_capacity, arr.shape[1])
                 self.arrays[key] = np.resize(arr, new_shape)
@@ -85,6 +127,7 @@ class PlantManager:
                 self.arrays[key] = np.resize(arr, new_capacity)
         
         self.capacity = new_capacity
+        self._bind_array_views()
 
     def update_aging_efficiencies(self):
         """
@@ -107,9 +150,8 @@ class PlantManager:
         """
         if self.count == 0: return
 
-        positions = self.arrays['positions'][:self.count]
-        x_coords = positions[:, 0]
-        y_coords = positions[:, 1]
+        x_coords = self.arrays['xs'][:self.count]
+        y_coords = self.arrays['ys'][:self.count]
 
         temperatures = environment.get_temperatures_vectorized(x_coords, y_coords)
         humidities = environment.get_humidities_vectorized(x_coords, y_coords)
@@ -170,13 +212,12 @@ class PlantManager:
         if self.count == 0: return
 
         # Get slices of the arrays for all living plants
-        positions = self.arrays['positions'][:self.count]
         radii = self.arrays['radii'][:self.count]
         root_radii = self.arrays['root_radii'][:self.count]
         core_radii = self.arrays['core_radii'][:self.count]
 
         # Get temperatures for all plants at once using the new vectorized method
-        temperatures = environment.get_temperatures_vectorized(positions[:, 0], positions[:, 1])
+        temperatures = environment.get_temperatures_vectorized(self.arrays['xs'][:self.count], self.arrays['ys'][:self.count])
 
         # Perform calculations for ALL plants at once
         canopy_areas = np.pi * radii**2
@@ -268,6 +309,26 @@ class PlantManager:
 
         self.arrays['photosynthesis_gains_per_second'][live_indices] = gain_rate
 
+    def sort_by_spatial_locality(self):
+        """
+        Reorders every plant array (and the plants list) along a Morton (Z-order) curve,
+        so neighbouring plants sit next to each other in memory. Positions are quantized
+        to competition grid cells, which is as fine as any spatial pass needs.
+        """
+        if self.count < 2: return
+
+        cells_x = (self.arrays['xs'][:self.count] / C.LIGHT_GRID_CELL_SIZE_CM).astype(np.int64)
+        cells_y = (self.arrays['ys'][:self.count] / C.LIGHT_GRID_CELL_SIZE_CM).astype(np.int64)
+        order = np.argsort(morton_codes(cells_x, cells_y), kind='stable')
+
+        # Every managed array is permuted, so a newly added array is covered automatically.
+        for arr in self.arrays.values():
+            arr[:self.count] = arr[:self.count][order]
+
+        self.plants = [self.plants[i] for i in order]
+        for new_index, plant in enumerate(self.plants):
+            plant.index = new_index
+
     def remove_plant(self, plant_to_remove):
         """
         Removes a plant efficiently using the 'swap and pop' method.
@@ -277,8 +338,9 @@ class PlantManager:
         to the swap block below to prevent data corruption.
         Current arrays to swap:
         - ages, heights, radii, root_radii, core_radii, energies,
-        - reproductive_energies_stored, positions, aging_efficiencies,
-        - hydraulic_efficiencies, metabolism_costs_per_second, canopy_areas
+        - reproductive_energies_stored, xs, ys, aging_efficiencies,
+        - hydraulic_efficiencies, metabolism_costs_per_second, canopy_areas,
+        - raster_radii, raster_root_radii, raster_heights, raster_pending, grid_bounds
         """
         if plant_to_remove.index >= self.count or self.plants[plant_to_remove.index] is not plant_to_remove:
             log.log(f"ERROR: Attempted to remove a plant with an invalid index or mismatched object. Index: {plant_to_remove.index}")
@@ -291,6 +353,10 @@ class PlantManager:
         idx_to_remove = plant_to_remove.index
         last_idx = self.count - 1
 
+        # If the plant was drawn into the competition grids, the cells it covered must be redrawn.
+        if not self.arrays['raster_pending'][idx_to_remove] and self.arrays['raster_radii'][idx_to_remove] > 0:
+            self.removed_grid_bounds.append(self.arrays['grid_bounds'][idx_to_remove].copy())
+
         if idx_to_remove == last_idx:
             log.log(f"DEBUG: Removing last plant at index {idx_to_remove}. No swap needed.")
         else:
@@ -314,6 +380,14 @@ class PlantManager:
         self.plants.pop()
         self.count -= 1
 
+    def take_removed_grid_bounds(self):
+        """Returns the grid bounds of plants removed since the last call as an (n, 8) array, and forgets them."""
+        if not self.removed_grid_bounds:
+            return np.empty((0, 8), dtype=np.int32)
+        removed = np.array(self.removed_grid_bounds, dtype=np.int32)
+        self.removed_grid_bounds.clear()
+        return removed
+
     def __iter__(self):
         """Allows the manager to be iterated over like a list (e.g., 'for plant in manager')."""
         return iter(self.plants)
@@ -1,32 +1,54 @@
 #quadtree.py
 
+import numpy as np
+from morton import morton_codes
+
 class Rectangle:
     """A simple rectangle class for defining boundaries."""
+    # Slots keep attribute access cheap, since these are read on every tree traversal step.
+    __slots__ = ('x', 'y', 'w', 'h', 'left', 'right', 'top', 'bottom')
+
     def __init__(self, x, y, w, h):
         self.x = x
         self.y = y
         self.w = w
         self.h = h
+        # The edges are precomputed once, instead of on every contains/intersects call.
+        self.left = x - w
+        self.right = x + w
+        self.top = y - h
+        self.bottom = y + h
 
     def contains(self, point):
         """Checks if a point is inside this rectangle."""
-        return (self.x - self.w <= point.x < self.x + self.w and
-                self.y - self.h <= point.y < self.y + self.h)
+        return (self.left <= point.x < self.right and
+                self.top <= point.y < self.bottom)
 
     def intersects(self, range_rect):
         """Checks if another rectangle intersects with this one."""
-        return not (range_rect.x - range_rect.w > self.x + self.w or
-                    range_rect.x + range_rect.w < self.x - self.w or
-                    range_rect.y - range_rect.h > self.y + self.h or
-                    range_rect.y + range_rect.h < self.y - self.h)
+        return not (range_rect.left > self.right or
+                    range_rect.right < self.left or
+                    range_rect.top > self.bottom or
+                    range_rect.bottom < self.top)
 
 class QuadTree:
-    """The QuadTree data structure."""
-    def __init__(self, boundary, capacity):
+    """
+    The QuadTree data structure.
+    Each inserted point gets a quadtree_node attribute pointing at the node that holds it,
+    so it can be removed or moved without searching for it.
+    """
+    __slots__ = ('boundary', 'capacity', 'parent', 'points', 'divided', 'northeast', 'northwest', 'southeast', 'southwest')
+
+    def __init__(self, boundary, capacity, parent=None):
         self.boundary = boundary
         self.capacity = capacity
+        self.parent = parent # The node this one is a sub-quadrant of, or None for the root.
         self.points = []
         self.divided = False
+        self.northeast = None
+        self.northwest = None
+        self.southeast = None
+        self.southwest = None
 
     def subdivide(self):
         """Divides the quadtree into four new sub-quadrants."""
@@ -36,67 +58,128 @@ class QuadTree:
         h = self.boundary.h / 2
 
         ne = Rectangle(x + w, y - h, w, h)
-        self.northeast = QuadTree(ne, self.capacity)
+        self.northeast = QuadTree(ne, self.capacity, self)
         nw = Rectangle(x - w, y - h, w, h)
-        self.northwest = QuadTree(nw, self.capacity)
+        self.northwest = QuadTree(nw, self.capacity, self)
         se = Rectangle(x + w, y + h, w, h)
-        self.southeast = QuadTree(se, self.capacity)
+        self.southeast = QuadTree(se, self.capacity, self)
         sw = Rectangle(x - w, y + h, w, h)
-        self.southwest = QuadTree(sw, self.capacity)
-        
+        self.southwest = QuadTree(sw, self.capacity, self)
+
         self.divided = True
 
+    def _child_containing(self, px, py):
+        """Returns the sub-quadrant whose boundary contains (px, py), or None."""
+        for child in (self.northeast, self.northwest, self.southeast, self.southwest):
+            b = child.boundary
+            if b.left <= px < b.right and b.top <= py < b.bottom:
+                return child
+        return None
+
     def insert(self, point):
         """Inserts a point into the quadtree."""
         if not self.boundary.contains(point):
             return False
 
-        if len(self.points) < self.capacity:
-            self.points.append(point)
-            return True
-        else:
-            if not self.divided:
-                self.subdivide()
-            
-            if self.northeast.insert(point): return True
-            if self.northwest.insert(point): return True
-            if self.southeast.insert(point): return True
-            if self.southwest.insert(point): return True
+        # Walk down iteratively instead of recursing into every child in turn.
+        # The sub-quadrants are half-open, so at most one of them can contain the point.
+        px, py = point.x, point.y
+        node = self
+        while True:
+            if len(node.points) < node.capacity:
+                node.points.append(point)
+                point.quadtree_node = node
+                return True
+            if not node.divided:
+                node.subdivide()
+            node = node._child_containing(px, py)
+            if node is None:
+                return False
+
+    def bulk_insert(self, points):
+        """
+        Inserts many points at once. They are first sorted along this tree's own quadrant
+        order (a Z-order curve), so consecutive inserts walk down the same branches.
+        """
+        if len(points) > 1:
+            order = np.argsort(self._z_order_keys(points), kind='stable')
+            points = [points[i] for i in order.tolist()]
+        for point in points:
+            self.insert(point)
+
+    def _z_order_keys(self, points):
+        """Returns the Z-order positions of many points, interleaving 16 levels of quadrant splits."""
+        b = self.boundary
+        xs = np.fromiter((point.x for point in points), dtype=np.float64, count=len(points))
+        ys = np.fromiter((point.y for point in points), dtype=np.float64, count=len(points))
+        gx = ((xs - b.left) / (b.right - b.left) * 0x10000).astype(np.int64)
+        gy = ((ys - b.top) / (b.bottom - b.top) * 0x10000).astype(np.int64)
+        # The x bits go to the even positions and the y bits to the odd ones, so within every
+        # node the keys visit the quadrants in NW, NE, SW, SE order, as query() does.
+        return morton_codes(gx, gy)
 
     def remove(self, point):
         """Removes a point from the quadtree. Returns True if successful."""
-        if not self.boundary.contains(point):
+        # The point remembers its node, so this works even if it moved since it was inserted.
+        node = getattr(point, 'quadtree_node', None)
+        if node is None:
             return False
+        node._detach(point)
+        return True
 
-        # Try to remove the point from this node's list
+    def _detach(self, point):
+        """Removes a point from this node's own list and clears its backpointer."""
         # We check by object identity ('is') because it's faster and we store references.
-        for i, p in enumerate(self.points):
+        points = self.points
+        for i, p in enumerate(points):
             if p is point:
-                self.points.pop(i)
-                return True
+                points.pop(i)
+                break
+        point.quadtree_node = None
 
-        # If we have children, delegate the removal to them
-        if self.divided:
-            if self.northeast.remove(point): return True
-            if self.northwest.remove(point): return True
-            if self.southeast.remove(point): return True
-            if self.southwest.remove(point): return True
-        
-        return False # Point was not found
+    def reposition(self, point):
+        """
+        Updates the tree after a point's coordinates have changed. Returns False if the point
+        has left this tree's boundary, in which case it is no longer stored.
+        A point that stays inside its node's boundary needs no change at all, which is the
+        common case for small moves. Otherwise it is re-inserted from the nearest ancestor
+        that contains it, instead of from the root.
+        """
+        node = getattr(point, 'quadtree_node', None)
+        if node is None:
+            return self.insert(point)
+        if node.boundary.contains(point):
+            return True
+
+        node._detach(point)
+        ancestor = node.parent
+        while ancestor is not None and not ancestor.boundary.contains(point):
+            ancestor = ancestor.parent
+        if ancestor is None:
+            return False
+        return ancestor.insert(point)
 
     def query(self, range_rect, found):
         """Queries for points within a given range."""
-        if not self.boundary.intersects(range_rect):
-            return found
-
-        for p in self.points:
-            if range_rect.contains(p):
-                found.append(p)
-        
-        if self.divided:
-            self.northwest.query(range_rect, found)
-            self.northeast.query(range_rect, found)
-            self.southwest.query(range_rect, found)
-            self.southeast.query(range_rect, found)
-        
-        return found
\ No newline at end of file
+        left, right = range_rect.left, range_rect.right
+        top, bottom = range_rect.top, range_rect.bottom
+
+        # An explicit stack replaces the recursion. Children are pushed in reverse
+        # so they are visited in the same order as before (NW, NE, SW, SE).
+        stack = [self]
+        pop = stack.pop
+        push = stack.extend
+        while stack:
+            node = pop()
+            b = node.boundary
+            if left > b.right or right < b.left or top > b.bottom or bottom < b.top:
+                continue
+
+            for p in node.points:
+                if left <= p.x < right and top <= p.y < bottom:
+                    found.append(p)
+
+            if node.divided:
+                push((node.southeast, node.southwest, node.northeast, node.northwest))
+
+        return found
@@ -0,0 +1,91 @@
+#timing_wheel.py
+
+import heapq
+
+class TimingWheel:
+    """
+    Holds creatures waiting for their next update, grouped into buckets one interval wide.
+    Updates are almost always scheduled a fixed delay ahead, so the buckets behave like a queue.
+    They live in a ring of slots indexed by tick number, with no hashing or sorting; the rare
+    bucket too far ahead for the ring goes into an overflow dict ordered by a min-heap.
+    Buckets must be popped in time order, and never scheduled earlier than the last pop.
+    """
+
+    def __init__(self, interval, slot_count):
+        self.interval = interval
+        self.slot_count = slot_count
+        self.slots = [None] * slot_count # Each slot holds one bucket (a list of creatures) or None.
+        self.base_tick = 0 # Every bucket in the ring has a tick in [base_tick, base_tick + slot_count).
+        self.bucket_count = 0 # Buckets in the ring and in the overflow together.
+        self.next_tick = None # Tick of the earliest bucket, kept current so peeks cost O(1); None when empty.
+        self.overflow = {}
+        self.overflow_heap = []
+
+    def get_bucket(self, time):
+        """Returns the list of creatures due to update at the interval containing time, creating it if needed."""
+        # Round the time down to its interval, e.g. to the hour for plants.
+        tick = int(time / self.interval)
+
+        # A bucket scheduled while it was still beyond the ring stays in the overflow.
+        if self.overflow:
+            bucket = self.overflow.get(tick)
+            if bucket is not None: return bucket
+
+        if tick - self.base_tick < self.slot_count:
+            slot = tick % self.slot_count
+            bucket = self.slots[slot]
+            if bucket is None:
+                bucket = self.slots[slot] = []
+                self._note_new_bucket(tick)
+            return bucket
+
+        bucket = self.overflow[tick] = []
+        heapq.heappush(self.overflow_heap, tick)
+        self._note_new_bucket(tick)
+        return bucket
+
+    def _note_new_bucket(self, tick):
+        """Counts a newly created bucket and keeps next_tick pointing at the earliest one."""
+        self.bucket_count += 1
+        if self.next_tick is None or tick < self.next_tick:
+            self.next_tick = tick
+
+    def _find_next_tick(self):
+        """Scans for the tick of the earliest bucket. The wheel must not be empty."""
+        next_tick = None
+        slots = self.slots
+        slot_count = self.slot_count
+        for tick in range(self.base_tick, self.base_tick + slot_count):
+            if slots[tick % slot_count] is not None:
+                next_tick = tick
+                break
+        if self.overflow_heap and (next_tick is None or self.overflow_heap[0] < next_tick):
+            next_tick = self.overflow_heap[0]
+        return next_tick
+
+    def peek_time(self):
+        """Returns the time of the earliest bucket, or infinity if nothing is scheduled."""
+        if self.next_tick is None: return float('inf')
+        return self.next_tick * self.interval
+
+    def pop(self, time):
+        """Removes and returns the bucket due at exactly this time, or None if there isn't one."""
+        # Buckets are popped in order, so only the earliest one can be due.
+        # Times from another wheel may fall between this wheel's ticks, and match nothing.
+        if self.next_tick is None or self.next_tick * self.interval != time: return None
+        tick = self.next_tick
+
+        bucket = self.overflow.pop(tick, None) if self.overflow else None
+        if bucket is not None:
+            heapq.heappop(self.overflow_heap) # The earliest bucket is always the heap's top.
+        else:
+            slot = tick % self.slot_count
+            bucket = self.slots[slot]
+            self.slots[slot] = None
+
+        self.bucket_count -= 1
+        # Nothing earlier is left, and nothing earlier can be scheduled, so the ring moves past this tick.
+        self.base_tick = tick + 1
+        # The scan for the following bucket runs once per pop, rather than on every peek.
+        self.next_tick = self._find_next_tick() if self.bucket_count else None
+        return bucket
@@ -1,5 +1,8 @@
 #world.py
 
+import os
+from itertools import compress
+from operator import attrgetter
 import pygame
 import numpy as np
 from creatures import Plant, Animal
@@ -9,10 +12,18 @@ from environment import Environment
 from ui import draw_loading_screen
 from quadtree import QuadTree, Rectangle
 from time_manager import TimeManager
+from timing_wheel import TimingWheel
 from plant_manager import PlantManager
+try:
+    from competition import compute_plant_competition
+except ImportError:
+    # Numba is missing, so fall back to the slower batched NumPy version of the same kernel.
+    from competition_numpy import compute_plant_competition
 from graphing_manager import GraphingManager
 import logger as log
 
+_is_alive = attrgetter('is_alive')
+
 class World:
     def __init__(self):
         log.log("Creating a new World...")
@@ -20,32 +31,49 @@ class World:
         self.environment = Environment()
         self.plant_manager = PlantManager()
         self.graphing_manager = GraphingManager()
-        self.animals = []
+        self.animals = [] # Unordered; each animal stores its list_index so it can be swap-and-popped out in O(1).
         self.newborns = []
         self.graveyard = []
         self.world_boundary = Rectangle(C.WORLD_WIDTH_CM / 2, C.WORLD_HEIGHT_CM / 2, C.WORLD_WIDTH_CM / 2, C.WORLD_HEIGHT_CM / 2)
         self.time_manager = TimeManager()
         
         # --- The scheduler for plant logic updates ---
-        self.plant_update_schedule = {}
-        self.animal_update_schedule = {}
+        # Updates are always scheduled one interval ahead, so each schedule is a timing wheel
+        # (a ring of buckets) rather than a dict of buckets plus a heap of their times.
+        self.plant_update_schedule = TimingWheel(C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS, C.SCHEDULER_WHEEL_SLOT_COUNT)
+        self.animal_update_schedule = TimingWheel(C.ANIMAL_UPDATE_TICK_SECONDS, C.SCHEDULER_WHEEL_SLOT_COUNT)
+        # Newborns waiting to be inserted into the quadtree and scheduled (see _flush_newborns).
+        self.pending_newborn_plants = []
+        self.pending_newborn_animals = []
 
         self.quadtree = QuadTree(self.world_boundary, C.QUADTREE_CAPACITY)
         
         # --- Global Competition Grid System ---
         self.next_competition_update_time = 0.0 # The sim time at which the next global update will occur.
+        self.next_spatial_sort_time = 0.0 # The sim time at which the plant arrays are next put into Morton order.
+        self.next_competition_rebuild_time = 0.0 # The sim time at which the grids are next redrawn in full.
         grid_width = int(C.WORLD_WIDTH_CM // C.LIGHT_GRID_CELL_SIZE_CM)
         grid_height = int(C.WORLD_HEIGHT_CM // C.LIGHT_GRID_CELL_SIZE_CM)
-        # The light grid stores the height of the tallest canopy in each cell.
-        self.light_grid = np.zeros((grid_width, grid_height), dtype=np.float32)
+        # The light grid stores the height of the tallest canopy in each cell, in fixed-point
+        # steps of LIGHT_GRID_HEIGHT_RESOLUTION_CM, which halves its size compared to float32.
+        self.light_grid = np.zeros((grid_width, grid_height), dtype=np.uint16)
         # The root grid stores the summed root radius of all plants in each cell, as a proxy for density.
+        # It stays float32, because it accumulates many small radii.
         self.root_grid = np.zeros((grid_width, grid_height), dtype=np.float32)
+        # World coordinates of the cell centers along each axis, shared by every plant's distance tests.
+        # They are single precision like the plant positions, so the kernels never mix in float64.
+        self.cell_centers_x = ((np.arange(grid_width) + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM).astype(np.float32)
+        self.cell_centers_y = ((np.arange(grid_height) + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM).astype(np.float32)
+        # The grids persist between updates. This flags the tiles that must be redrawn at the next one.
+        tiles_x = -(-grid_width // C.COMPETITION_GRID_TILE_CELLS)
+        tiles_y = -(-grid_height // C.COMPETITION_GRID_TILE_CELLS)
+        self.competition_dirty_tiles = np.zeros(tiles_x * tiles_y, dtype=np.bool_)
         log.log(f"Competition grids initialized with size ({grid_width}x{grid_height}).")
 
         self.debug_focused_creature_id = None
         self.max_plant_radius = 0.0 # The radius of the largest plant in the world, in cm.
         
-        self.last_log_time_seconds = 0.0
+        self.next_log_time = C.UI_LOG_INTERVAL_SECONDS # The sim time at which the next statistics report is printed.
         self.plant_deaths_this_period = 0
         self.animal_deaths_this_period = 0
         self.plant_births_this_period = 0
@@ -57,26 +85,41 @@ class World:
         Schedules a plant to have its update logic run after a certain delay.
         It groups plants into hourly buckets to process them together.
         """
+        # Add the plant to the list for its scheduled update time.
+        self._get_plant_schedule_bucket(delay_seconds).append(plant)
+
+    def _get_plant_schedule_bucket(self, delay_seconds):
+        """Returns the list of plants due to update after delay_seconds, creating it if needed."""
         # Calculate the future time for the update
         future_time = self.time_manager.total_sim_seconds + delay_seconds
-        
-        # Round the time down to the nearest hour. This is the "key" for our schedule dictionary.
-        # All plants updating in the same hour will be grouped together.
-        schedule_key = int(future_time / C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS) * C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS
-        
-        # If this is the first plant scheduled for this exact hour, create a new list for it.
-        if schedule_key not in self.plant_update_schedule:
-            self.plant_update_schedule[schedule_key] = []
-            
-        # Add the plant to the list for its scheduled update time.
-        self.plant_update_schedule[schedule_key].append(plant)
+        # The wheel rounds the time down to the nearest hour, so all plants updating in the same hour are grouped together.
+        return self.plant_update_schedule.get_bucket(future_time)
 
     def schedule_animal_update(self, animal, delay_seconds):
+        self._get_animal_schedule_bucket(delay_seconds).append(animal)
+
+    def _get_animal_schedule_bucket(self, delay_seconds):
         future_time = self.time_manager.total_sim_seconds + delay_seconds
-        schedule_key = int(future_time / C.ANIMAL_UPDATE_TICK_SECONDS) * C.ANIMAL_UPDATE_TICK_SECONDS
-        if schedule_key not in self.animal_update_schedule:
-            self.animal_update_schedule[schedule_key] = []
-        self.animal_update_schedule[schedule_key].append(animal)
+        return self.animal_update_schedule.get_bucket(future_time)
+
+    def _flush_newborns(self):
+        """
+        Inserts every creature born since the last call into the quadtree and schedules its first update.
+        It runs while the clock still reads their birth time, so all newborn plants share
+        one bucket (and all newborn animals another) and each kind is added in one extend.
+        """
+        plants = self.pending_newborn_plants
+        animals = self.pending_newborn_animals
+        if not plants and not animals: return
+
+        # A newborn that already died (e.g. a seed on invalid terrain) has nothing to be found by.
+        self.quadtree.bulk_insert([creature for creature in plants + animals if creature.is_alive])
+        if plants:
+            self._get_plant_schedule_bucket(C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS).extend(plants)
+            plants.clear()
+        if animals:
+            self._get_animal_schedule_bucket(C.ANIMAL_UPDATE_TICK_SECONDS).extend(animals)
+            animals.clear()
 
     def pre_generate_all_chunks(self, screen, font):
         """Generates all chunks for ALL view modes (Terrain, Temp, Humidity)."""
@@ -87,35 +130,23 @@ class World:
         total_work = (total_chunks_x * total_chunks_y) * C.ENVIRONMENT_VIEW_MODE_COUNT
         work_done = 0
 
-        self.environment.toggle_view_mode() 
-        self.environment.toggle_view_mode() 
-        for cx in range(total_chunks_x):
-            for cy in range(total_chunks_y):
-                pygame.event.pump()
-                self.environment.generate_chunk_if_needed(cx, cy)
-                work_done += 1
-                if work_done % C.UI_LOADING_BAR_UPDATE_INTERVAL == 0:
-                    draw_loading_screen(screen, font, work_done, total_work)
-        
-        self.environment.toggle_view_mode() 
-        for cx in range(total_chunks_x):
-            for cy in range(total_chunks_y):
+        # Textures saved by an earlier launch are loaded first, and then only need counting below.
+        loaded_from_disk = self.environment.load_chunk_disk_cache(total_chunks_x, total_chunks_y)
+
+        # Every view mode of a chunk is generated in one pass, and the chunks themselves
+        # are spread over worker processes. Progress is reported as chunks complete.
+        worker_count = C.PREGENERATION_WORKER_COUNT or os.cpu_count() or 1
+        log.log(f"Pre-generating chunks with {worker_count} worker process(es).")
+        chunk_coords = [(cx, cy) for cx in range(total_chunks_x) for cy in range(total_chunks_y)]
+        for chunks_done, _ in enumerate(self.environment.generate_chunks_for_all_view_modes(chunk_coords, worker_count), 1):
+            work_done = chunks_done * C.ENVIRONMENT_VIEW_MODE_COUNT
+            # The event queue only needs pumping as often as the loading bar is redrawn.
+            if chunks_done % C.UI_LOADING_BAR_UPDATE_INTERVAL == 0 or work_done == total_work:
                 pygame.event.pump()
-                self.environment.generate_chunk_if_needed(cx, cy)
-                work_done += 1
-                if work_done % C.UI_LOADING_BAR_UPDATE_INTERVAL == 0:
-                    draw_loading_screen(screen, font, work_done, total_work)
-
-        self.environment.toggle_view_mode() 
-        for cx in range(total_chunks_x):
-            for cy in range(total_chunks_y):
-                pygame.event.pump()
-                self.environment.generate_chunk_if_needed(cx, cy)
-                work_done += 1
-                if work_done % C.UI_LOADING_BAR_UPDATE_INTERVAL == 0 or work_done == total_work:
-                    draw_loading_screen(screen, font, work_done, total_work)
+                draw_loading_screen(screen, font, work_done, total_work)
 
-        self.environment.toggle_view_mode() 
+        if not loaded_from_disk:
+            self.environment.save_chunk_disk_cache(total_chunks_x, total_chunks_y)
         
         log.log(f"World pre-generation complete. {work_done} total chunk textures loaded.")
 
@@ -127,268 +158,142 @@ class World:
         self.quadtree.insert(initial_plant)
         
         initial_animal = Animal(C.INITIAL_ANIMAL_POSITION[0], C.INITIAL_ANIMAL_POSITION[1])
-        self.animals.append(initial_animal)
+        initial_animal.add_to_world(self)
         self.schedule_animal_update(initial_animal, C.ANIMAL_UPDATE_TICK_SECONDS)
         self.quadtree.insert(initial_animal)
         log.log("World population complete.")
 
     def add_newborn(self, creature):
         self.newborns.append(creature)
-        self.quadtree.insert(creature)
         
-        if isinstance(creature, Plant):
+        # The quadtree insert and the scheduling are deferred to _flush_newborns, which does both in bulk.
+        if creature.is_plant:
             self.plant_births_this_period += 1
-            self.schedule_plant_update(creature, C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS)
-        elif isinstance(creature, Animal):
-            self.schedule_animal_update(creature, C.ANIMAL_UPDATE_TICK_SECONDS)
+            self.pending_newborn_plants.append(creature)
+        else:
+            self.pending_newborn_animals.append(creature)
 
     def report_death(self, creature):
         """A creature calls this method when it dies to be counted."""
         self.graveyard.append(creature)
         self.quadtree.remove(creature)
-        if isinstance(creature, Plant):
+        if creature.is_plant:
             self.plant_deaths_this_period += 1
-        elif isinstance(creature, Animal):
+        else:
             self.animal_deaths_this_period += 1
 
     def update_creature_in_quadtree(self, creature):
-        """Removes and re-inserts a creature to update its position in the quadtree."""
-        self.quadtree.remove(creature)
-        self.quadtree.insert(creature)
+        """Moves a creature to the right quadtree node after its position changed."""
+        self.quadtree.reposition(creature)
 
     def _update_max_plant_radius(self):
         """
         Recalculates the largest plant radius in the world using NumPy for efficiency.
         """
         pm = self.plant_manager
+        # Radii only move the maximum rarely, so the scan is skipped unless a plant flagged it.
+        if not pm.max_radius_dirty: return
+        pm.max_radius_dirty = False
         if pm.count == 0:
             self.max_plant_radius = 0.0
         else:
             # Use np.max on the radii array for a fast, vectorized operation.
-            self.max_plant_radius = np.max(pm.arrays['radii'][:pm.count])
+            self.max_plant_radius = float(np.max(pm.radii[:pm.count]))
 
-    def _populate_competition_grids(self):
-        """Pass 1: Populate the light and root grids with data from all plants."""
-        self.light_grid.fill(0)
-        self.root_grid.fill(0)
+    def _update_plant_competition(self):
+        """Populates the light and root grids, then uses them to calculate competition for each plant."""
         pm = self.plant_manager
 
-        # Iterate by index over the NumPy arrays, the new source of truth.
-        for i in range(pm.count):
-            radius = pm.arrays['radii'][i]
-            if radius <= 0: continue
-
-            x, y = pm.arrays['positions'][i]
-            height = pm.arrays['heights'][i]
-            root_radius = pm.arrays['root_radii'][i]
-
-            # --- Rasterize Canopy for Light Grid (Vectorized) ---
-            min_gx = int(max(0, (x - radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gx = int(min(self.light_grid.shape[0] - 1, (x + radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            min_gy = int(max(0, (y - radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gy = int(min(self.light_grid.shape[1] - 1, (y + radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-
-            # Create a grid of coordinates for the bounding box of the plant
-            gx_range = np.arange(min_gx, max_gx + 1)
-            gy_range = np.arange(min_gy, max_gy + 1)
-            gx_grid, gy_grid = np.meshgrid(gx_range, gy_range)
-
-            # Calculate the world coordinates of the center of each grid cell
-            cell_wx = (gx_grid + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-            cell_wy = (gy_grid + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-
-            # Find all cells within the plant's radius
-            dist_sq = (x - cell_wx)**2 + (y - cell_wy)**2
-            cells_inside_canopy_mask = dist_sq <= radius**2
-
-            # Get the grid indices where the condition is true
-            gx_indices = gx_grid[cells_inside_canopy_mask]
-            gy_indices = gy_grid[cells_inside_canopy_mask]
-
-            # Update the light grid using advanced indexing.
-            # We take the maximum of the current value and the plant's height.
-            current_max_heights = self.light_grid[gx_indices, gy_indices]
-            self.light_grid[gx_indices, gy_indices] = np.maximum(current_max_heights, height)
-
-            # --- Rasterize Roots for Root Grid (Vectorized) ---
-            min_gx_root = int(max(0, (x - root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gx_root = int(min(self.root_grid.shape[0] - 1, (x + root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            min_gy_root = int(max(0, (y - root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gy_root = int(min(self.root_grid.shape[1] - 1, (y + root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-
-            # Create a grid of coordinates for the bounding box of the roots
-            gx_range_root = np.arange(min_gx_root, max_gx_root + 1)
-            gy_range_root = np.arange(min_gy_root, max_gy_root + 1)
-            gx_grid_root, gy_grid_root = np.meshgrid(gx_range_root, gy_range_root)
-
-            # Calculate the world coordinates of the center of each grid cell
-            cell_wx_root = (gx_grid_root + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-            cell_wy_root = (gy_grid_root + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-
-            # Find all cells within the plant's root radius
-            dist_sq_root = (x - cell_wx_root)**2 + (y - cell_wy_root)**2
-            cells_inside_roots_mask = dist_sq_root <= root_radius**2
-
-            # Get the grid indices where the condition is true
-            gx_indices_root = gx_grid_root[cells_inside_roots_mask]
-            gy_indices_root = gy_grid_root[cells_inside_roots_mask]
-
-            # Add the root radius to all covered cells using advanced indexing
-            self.root_grid[gx_indices_root, gy_indices_root] += root_radius
-
-    def _calculate_plant_competition(self):
-        """Pass 2: Use the populated grids to calculate competition for each plant."""
-        cell_area = C.LIGHT_GRID_CELL_SIZE_CM ** 2
-        pm = self.plant_manager
-
-        # Create temporary arrays to store the results of our calculations.
-        shaded_canopy_areas = np.zeros(pm.count, dtype=np.float32)
-        overlapped_root_areas = np.zeros(pm.count, dtype=np.float32)
-
-        # Iterate by index to read from NumPy and write to the temporary arrays.
-        for i in range(pm.count):
-            radius = pm.arrays['radii'][i]
-            if radius <= 0: continue
-
-            x, y = pm.arrays['positions'][i]
-            height = pm.arrays['heights'][i]
-            root_radius = pm.arrays['root_radii'][i]
-
-            # --- Calculate Shaded Area (Vectorized) ---
-            min_gx = int(max(0, (x - radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gx = int(min(self.light_grid.shape[0] - 1, (x + radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            min_gy = int(max(0, (y - radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gy = int(min(self.light_grid.shape[1] - 1, (y + radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-
-            # Create a grid of coordinates for the bounding box of the plant
-            gx_range = np.arange(min_gx, max_gx + 1)
-            gy_range = np.arange(min_gy, max_gy + 1)
-            gx_grid, gy_grid = np.meshgrid(gx_range, gy_range)
-
-            # Calculate the world coordinates of the center of each grid cell
-            cell_wx = (gx_grid + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-            cell_wy = (gy_grid + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-
-            # Find all cells within the plant's radius
-            dist_sq = (x - cell_wx)**2 + (y - cell_wy)**2
-            cells_inside_canopy_mask = dist_sq <= radius**2
-
-            # Get the grid indices where the condition is true
-            gx_indices = gx_grid[cells_inside_canopy_mask]
-            gy_indices = gy_grid[cells_inside_canopy_mask]
-
-            # From the cells inside the canopy, find which ones are shaded
-            canopy_heights_on_grid = self.light_grid[gx_indices, gy_indices]
-            shaded_cells_mask = height < canopy_heights_on_grid
-
-            # The total shaded area is the number of shaded cells times the area of a cell
-            num_shaded_cells = np.sum(shaded_cells_mask)
-            shaded_canopy_areas[i] = num_shaded_cells * cell_area
-
-            # --- Calculate Root Overlap (Vectorized) ---
-            min_gx_root = int(max(0, (x - root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gx_root = int(min(self.root_grid.shape[0] - 1, (x + root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            min_gy_root = int(max(0, (y - root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-            max_gy_root = int(min(self.root_grid.shape[1] - 1, (y + root_radius) / C.LIGHT_GRID_CELL_SIZE_CM))
-
-            my_root_area = root_radius**2 * np.pi
-
-            # Create a grid of coordinates for the bounding box of the roots
-            gx_range_root = np.arange(min_gx_root, max_gx_root + 1)
-            gy_range_root = np.arange(min_gy_root, max_gy_root + 1)
-            gx_grid_root, gy_grid_root = np.meshgrid(gx_range_root, gy_range_root)
-
-            # Calculate the world coordinates of the center of each grid cell
-            cell_wx_root = (gx_grid_root + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-            cell_wy_root = (gy_grid_root + 0.5) * C.LIGHT_GRID_CELL_SIZE_CM
-
-            # Find all cells within the plant's root radius
-            dist_sq_root = (x - cell_wx_root)**2 + (y - cell_wy_root)**2
-            cells_inside_roots_mask = dist_sq_root <= root_radius**2
-
-            # Get the grid indices where the condition is true
-            gx_indices_root = gx_grid_root[cells_inside_roots_mask]
-            gy_indices_root = gy_grid_root[cells_inside_roots_mask]
-
-            # Get the total root pressure from the grid for all cells under this plant's roots
-            total_pressures = self.root_grid[gx_indices_root, gy_indices_root]
-
-            # Find which of these cells are actually being competed for
-            competed_cells_mask = total_pressures > root_radius
-
-            # Calculate the overlap ratio ONLY for the cells with competition
-            competed_pressures = total_pressures[competed_cells_mask]
-            overlap_ratios = (competed_pressures - root_radius) / competed_pressures
-
-            # The total overlapped area is the sum of the ratios multiplied by the area of a cell
-            overlapped_root_areas[i] = np.sum(overlap_ratios) * cell_area
-            
-            # Clamp values to be safe
-            shaded_canopy_areas[i] = min(shaded_canopy_areas[i], radius**2 * np.pi)
-            overlapped_root_areas[i] = min(overlapped_root_areas[i], my_root_area)
-
-                # --- Final Assignment Step ---
-        # Now, assign the calculated values from our temporary arrays.
-        # Step 1: Bulk copy the results into the PlantManager's NumPy arrays.
-        pm.arrays['overlapped_root_areas'][:pm.count] = overlapped_root_areas
-        pm.arrays['shaded_canopy_areas'][:pm.count] = shaded_canopy_areas
-
-        # Step 2: Assign values to the individual Python objects (this will be phased out later).
-        for i in range(pm.count):
-            pm.plants[i].shaded_canopy_area = shaded_canopy_areas[i]
-            pm.plants[i].overlapped_root_area = overlapped_root_areas[i]
+        # Only the parts of the grids where plants changed are redrawn, except for a periodic full rebuild.
+        full_rebuild = self.next_competition_rebuild_time <= self.time_manager.total_sim_seconds
+        if full_rebuild:
+            self.next_competition_rebuild_time += C.PLANT_COMPETITION_FULL_REBUILD_INTERVAL_SECONDS
+
+        # Both passes run in one compiled kernel that shares each plant's cached grid bounding boxes.
+        # It writes its results straight into the PlantManager's persistent arrays.
+        shaded_canopy_areas = pm.shaded_canopy_areas[:pm.count]
+        overlapped_root_areas = pm.overlapped_root_areas[:pm.count]
+        compute_plant_competition(pm.xs, pm.ys, pm.radii, pm.heights, pm.root_radii,
+                                  pm.raster_radii, pm.raster_heights, pm.raster_root_radii, pm.raster_pending,
+                                  pm.grid_bounds, pm.count, pm.take_removed_grid_bounds(),
+                                  self.competition_dirty_tiles, full_rebuild, C.PLANT_COMPETITION_REDRAW_THRESHOLD_CM,
+                                  self.light_grid, self.root_grid,
+                                  C.LIGHT_GRID_CELL_SIZE_CM, self.cell_centers_x, self.cell_centers_y,
+                                  C.LIGHT_GRID_HEIGHT_RESOLUTION_CM, C.COMPETITION_GRID_TILE_CELLS,
+                                  shaded_canopy_areas, overlapped_root_areas)
 
     def _process_housekeeping(self):
         """Handles adding newborns to the main lists and removing dead creatures."""
+        # Normally a no-op, since the event loop places newborns as they arrive.
+        self._flush_newborns()
         # --- Housekeeping ---
-        for dead_creature in self.graveyard:
-            if isinstance(dead_creature, Plant):
-                self.plant_manager.remove_plant(dead_creature)
-            elif isinstance(dead_creature, Animal):
-                if dead_creature in self.animals: self.animals.remove(dead_creature)
-        self.graveyard.clear()
-
-        # Process newborns
+        # Each creature knows which container it lives in, so no type checks are needed here.
+        # Newborns are added first, so one that already died is removed again just below.
         for creature in self.newborns:
-            if isinstance(creature, Plant):
-                self.plant_manager.add_plant(creature)
-            elif isinstance(creature, Animal):
-                self.animals.append(creature)
+            creature.add_to_world(self)
         self.newborns.clear()
 
+        # Both plants and animals are removed with an O(1) swap-and-pop.
+        for dead_creature in self.graveyard:
+            dead_creature.remove_from_world(self)
+        self.graveyard.clear()
+
         # --- Population Statistics Logging & World State Update ---
-        if self.time_manager.total_sim_seconds - self.last_log_time_seconds >= C.UI_LOG_INTERVAL_SECONDS:
+        current_time = self.time_manager.total_sim_seconds
+        if current_time >= self.next_log_time:
             self._print_population_statistics()
-            self.last_log_time_seconds = self.time_manager.total_sim_seconds
+            # Reports stay on a fixed cadence. If a long step skipped whole periods, jump past them.
+            self.next_log_time += C.UI_LOG_INTERVAL_SECONDS
+            if self.next_log_time <= current_time:
+                self.next_log_time += (current_time - self.next_log_time) // C.UI_LOG_INTERVAL_SECONDS * C.UI_LOG_INTERVAL_SECONDS + C.UI_LOG_INTERVAL_SECONDS
             self.plant_births_this_period = 0
             self.plant_deaths_this_period = 0
             self.animal_deaths_this_period = 0
         
         self._update_max_plant_radius()
 
+    def _get_next_event_time(self):
+        """Returns the sim time of the next scheduled creature update, or infinity if none is scheduled."""
+        return min(self.plant_update_schedule.peek_time(), self.animal_update_schedule.peek_time())
+
     def update_in_bulk(self, large_delta_time):
         """
         Processes all scheduled events within a large time window efficiently.
         This is the new main entry point for simulation logic from main.py.
         """
+        start_time = self.time_manager.total_sim_seconds
+        end_time = start_time + large_delta_time
+
+        # Creatures added since the last frame were born at the current time, so place them now.
+        self._flush_newborns()
+
+        # --- Fast path: nothing is scheduled inside this time slice ---
+        # At low speeds most frames contain no events at all, so only the clock needs to advance.
+        # The vectorized rates below are only read by events, so skipping them here is exact.
+        if self.next_competition_update_time >= end_time and self._get_next_event_time() >= end_time:
+            self.time_manager.total_sim_seconds = end_time
+            self._process_housekeeping()
+            return
+
         # --- Perform vectorized calculations once before the main loop ---
         self.plant_manager.update_aging_efficiencies()
         self.plant_manager.update_hydraulic_efficiencies()
         self.plant_manager.update_environmental_efficiencies(self.environment)
         self.plant_manager.update_soil_efficiencies()
-        self.plant_manager.update_photosynthesis_gains()
+        # Metabolism runs before photosynthesis because it refreshes the cached canopy areas that photosynthesis reads.
         self.plant_manager.update_metabolism_costs(self.environment)
-
-        start_time = self.time_manager.total_sim_seconds
-        end_time = start_time + large_delta_time
+        self.plant_manager.update_photosynthesis_gains()
 
         # --- Process global updates that fall within this time slice ---
         while self.next_competition_update_time < end_time:
             # Set the clock to the precise time of this global event to maintain temporal accuracy
             self.time_manager.total_sim_seconds = self.next_competition_update_time
             log.log(f"--- Performing Global Competition Update at Day {self.time_manager.total_sim_seconds / C.SECONDS_PER_DAY:.1f} ---")
-            self._populate_competition_grids()
-            self._calculate_plant_competition()
+            # Periodically re-sort the plant arrays so the grid passes below walk memory in spatial order.
+            if self.next_spatial_sort_time <= self.next_competition_update_time:
+                self.plant_manager.sort_by_spatial_locality()
+                self.next_spatial_sort_time += C.PLANT_SPATIAL_SORT_INTERVAL_SECONDS
+            self._update_plant_competition()
             # Schedule the next update
             self.next_competition_update_time += C.PLANT_COMPETITION_UPDATE_INTERVAL_SECONDS
         
@@ -396,42 +301,51 @@ class World:
         self.time_manager.total_sim_seconds = start_time
 
         # --- Continuously process individual creature events in a loop until the time window is filled ---
+        # The loop runs once per scheduled bucket, so the objects it touches are bound to locals first.
+        time_manager = self.time_manager
+        plant_schedule = self.plant_update_schedule
+        animal_schedule = self.animal_update_schedule
+        plant_time_step = C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS
+        animal_time_step = C.ANIMAL_UPDATE_TICK_SECONDS
         while True:
-            # Find the time of the very next scheduled event, if any
-            next_plant_time = min(self.plant_update_schedule.keys()) if self.plant_update_schedule else float('inf')
-            next_animal_time = min(self.animal_update_schedule.keys()) if self.animal_update_schedule else float('inf')
-            next_event_time = min(next_plant_time, next_animal_time)
+            # Find the time of the very next scheduled event, if any (as in _get_next_event_time)
+            next_event_time = min(plant_schedule.peek_time(), animal_schedule.peek_time())
 
             # If the next event is outside our current time slice, stop processing for this frame.
             if next_event_time >= end_time:
                 break
 
             # Set the world clock to the exact time of the current event
-            self.time_manager.total_sim_seconds = next_event_time
+            time_manager.total_sim_seconds = next_event_time
             
-            # Pop the creatures scheduled for this exact time from the schedule
-            creatures_to_update = []
-            if next_event_time in self.plant_update_schedule:
-                creatures_to_update.extend(self.plant_update_schedule.pop(next_event_time))
-            if next_event_time in self.animal_update_schedule:
-                creatures_to_update.extend(self.animal_update_schedule.pop(next_event_time))
-
-            # Process the creatures for this event time
-            for creature in creatures_to_update:
-                if creature.is_alive:
-                    if isinstance(creature, Plant):
-                        time_step = C.PLANT_LOGIC_UPDATE_INTERVAL_SECONDS
-                        creature.update(self, time_step)
-                        if creature.is_alive:
-                            self.schedule_plant_update(creature, time_step)
-                    elif isinstance(creature, Animal):
-                        time_step = C.ANIMAL_UPDATE_TICK_SECONDS
-                        creature.update(self, time_step)
-                        if creature.is_alive:
-                            self.schedule_animal_update(creature, time_step)
+            # Pop the creatures scheduled for this exact time from each schedule.
+            # Each schedule only ever holds one kind of creature, so no type check is needed.
+            # update() already returns early for a creature that died before its turn
+            # (e.g. crushed or eaten earlier in the bucket), so the loop itself has no checks.
+            # Survivors all move to the same bucket one interval ahead. They are picked out
+            # in one C-level pass once the whole bucket has run, so a creature killed later in
+            # the bucket is dropped here too, and added in one extend, just before the newborns
+            # that join that bucket.
+            plants = plant_schedule.pop(next_event_time)
+            if plants is not None:
+                # Sprouted plants do their arithmetic in one compiled batch, in the same order.
+                Plant.update_batch(self, plants, plant_time_step)
+                rescheduled = list(compress(plants, map(_is_alive, plants)))
+                if rescheduled:
+                    self._get_plant_schedule_bucket(plant_time_step).extend(rescheduled)
+                self._flush_newborns()
+
+            animals = animal_schedule.pop(next_event_time)
+            if animals is not None:
+                for animal in animals:
+                    animal.update(self, animal_time_step)
+                rescheduled = list(compress(animals, map(_is_alive, animals)))
+                if rescheduled:
+                    self._get_animal_schedule_bucket(animal_time_step).extend(rescheduled)
+                self._flush_newborns()
         
         # --- Finalize the time update and clean up ---
-        self.time_manager.total_sim_seconds = end_time
+        time_manager.total_sim_seconds = end_time
         self._process_housekeeping()
 
     def toggle_environment_view(self):
@@ -439,38 +353,98 @@ class World:
         self.camera.dirty = True
         self.camera.zoom_changed = True
 
+    def _get_camera_view_rect(self):
+        """
+        Returns the world-space Rectangle currently visible through the camera.
+        The rectangle is grown by the largest creature extent, because the quadtree
+        only stores creature centers while their drawings extend beyond them.
+        """
+        top_left_wx, top_left_wy = self.camera.screen_to_world(0, 0)
+        bottom_right_wx, bottom_right_wy = self.camera.screen_to_world(C.SCREEN_WIDTH, C.SCREEN_HEIGHT)
+        margin = (max(self.max_plant_radius, C.ANIMAL_INITIAL_WIDTH_CM, C.ANIMAL_INITIAL_HEIGHT_CM) +
+                  C.UI_CULLING_MARGIN_PIXELS / self.camera.zoom)
+        half_w = (bottom_right_wx - top_left_wx) / 2
+        half_h = (bottom_right_wy - top_left_wy) / 2
+        return Rectangle(top_left_wx + half_w, top_left_wy + half_h, half_w + margin, half_h + margin)
+
+    def _get_visible_world_fraction(self, view):
+        """Returns the fraction of the world's area that lies inside the given view Rectangle."""
+        visible_w = max(0.0, min(view.right, C.WORLD_WIDTH_CM) - max(view.left, 0.0))
+        visible_h = max(0.0, min(view.bottom, C.WORLD_HEIGHT_CM) - max(view.top, 0.0))
+        return (visible_w * visible_h) / (C.WORLD_WIDTH_CM * C.WORLD_HEIGHT_CM)
+
     def draw(self, screen):
         self.environment.draw(screen, self.camera)
         self.camera.draw_world_border(screen)
-        for plant in self.plant_manager:
-            plant.draw(screen, self.camera)
-        for animal in self.animals:
+
+        # Only draw the creatures the quadtree reports as being inside the camera's view.
+        # Zoomed far out, nearly everything is visible, so the tree walk would only add overhead.
+        view = self._get_camera_view_rect()
+        if self._get_visible_world_fraction(view) >= C.UI_CULLING_FULL_LIST_VIEW_FRACTION:
+            # The plant positions are already NumPy columns, so the few plants outside the view
+            # are still culled, with one vectorized test instead of a tree walk.
+            pm = self.plant_manager
+            xs = pm.xs[:pm.count]
+            ys = pm.ys[:pm.count]
+            inside = (xs >= view.left) & (xs < view.right) & (ys >= view.top) & (ys < view.bottom)
+            visible = list(compress(pm.plants, inside.tolist())) + self.animals
+        else:
+            visible = self.quadtree.query(view, [])
+        visible_plants = []
+        visible_animals = []
+        for creature in visible:
+            if not creature.is_alive: continue
+            if creature.is_plant:
+                visible_plants.append(creature)
+            else:
+                visible_animals.append(creature)
+        # Plants contribute cached sprites to one list that is handed to SDL in a single
+        # blits() call. The blits follow the order of visible_plants.
+        plant_blits = []
+        Plant.add_batch_blits(visible_plants, self.camera, plant_blits)
+        screen.blits(plant_blits, doreturn=False)
+        # Animals are drawn last so they stay on top of the plants.
+        for animal in visible_animals:
             animal.draw(screen, self.camera)
     
     def handle_click(self, screen_pos):
         """Handles a mouse click, printing a debug report and toggling focused logging."""
         world_x, world_y = self.camera.screen_to_world(screen_pos[0], screen_pos[1])
+        # Match the dtype of the position arrays so the hit test stays in single precision.
+        world_x, world_y = np.float32(world_x), np.float32(world_y)
         pm = self.plant_manager
 
-        # Iterate by index over the NumPy arrays to perform the collision check.
-        for i in range(pm.count):
-            x, y = pm.arrays['positions'][i]
-            radius = pm.arrays['radii'][i]
-            dist_sq = (world_x - x)**2 + (world_y - y)**2
-            if dist_sq <= radius**2:
-                # Once a match is found, get the corresponding object for its ID.
-                plant = pm.plants[i]
-                log.log(f"Clicked on a plant at world coordinates ({int(x)}, {int(y)}).")
-                
-                if self.debug_focused_creature_id == plant.id:
-                    self.debug_focused_creature_id = None
-                    self.graphing_manager.clear_focus()
-                    log.log(f"DEBUG: Stopped focusing on Plant ID: {plant.id}. Detailed logs disabled.")
-                else:
-                    self.debug_focused_creature_id = plant.id
-                    self.graphing_manager.set_focused_plant(plant.id)
-                    log.log(f"DEBUG: Now focusing on Plant ID: {plant.id}. Detailed logs enabled.")
-                return
+        if pm.count == 0: return
+
+        # Only plants whose centers lie within the largest radius of the click can contain it,
+        # so the quadtree narrows the search before the vectorized hit test.
+        reach = self.max_plant_radius + 1.0
+        candidates = self.quadtree.query(Rectangle(float(world_x), float(world_y), reach, reach), [])
+        indices = np.fromiter((c.index for c in candidates if c.is_plant and c.is_alive), dtype=np.intp)
+        if indices.size == 0: return
+        # Sorting keeps the old behaviour of picking the first match in PlantManager order.
+        indices.sort()
+
+        dx = pm.xs[indices] - world_x
+        dy = pm.ys[indices] - world_y
+        radii = pm.radii[indices]
+        hits = np.flatnonzero(dx * dx + dy * dy <= radii * radii)
+        if hits.size == 0: return
+
+        # Take the first match and get the corresponding object for its ID.
+        i = indices[hits[0]]
+        x, y = pm.xs[i], pm.ys[i]
+        plant = pm.plants[i]
+        log.log(f"Clicked on a plant at world coordinates ({int(x)}, {int(y)}).")
+        
+        if self.debug_focused_creature_id == plant.id:
+            self.debug_focused_creature_id = None
+            self.graphing_manager.clear_focus()
+            log.log(f"DEBUG: Stopped focusing on Plant ID: {plant.id}. Detailed logs disabled.")
+        else:
+            self.debug_focused_creature_id = plant.id
+            self.graphing_manager.set_focused_plant(plant.id)
+            log.log(f"DEBUG: Now focusing on Plant ID: {plant.id}. Detailed logs enabled.")
             
     def _print_population_statistics(self):
         """Prints a formatted summary of the world's population statistics."""